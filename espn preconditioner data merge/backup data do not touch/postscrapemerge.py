@@ -1,25 +1,232 @@
+import numpy as np
 import pandas as pd
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+try:
+    import pyarrow
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # UFC data file types
 DATA_TYPES = ['ground_data', 'clinch_data', 'striking_data']
 
-def merge_ufc_data(living_file, latest_file, backup=True):
+# Columns identifying a single fight record
+KEY_COLUMNS = ['Player', 'Date', 'Opponent']
+
+# Format of the ESPN fight dates, e.g. "Mar 15, 2025"
+DATE_FORMAT = '%b %d, %Y'
+
+# Repeated label columns stored as categoricals so hashing and sorting work on int codes
+CATEGORY_COLUMNS = ['Player', 'Opponent', 'Event', 'Result']
+
+# Living files larger than this are merged in streaming chunks to bound memory
+STREAMING_THRESHOLD_BYTES = 1024 ** 3
+STREAMING_CHUNKSIZE = 200_000
+
+def read_csv(path):
+    """Read a CSV file, using the multithreaded pyarrow parser when installed"""
+    if PYARROW_AVAILABLE:
+        return pd.read_csv(path, engine='pyarrow')
+    return pd.read_csv(path)
+
+def align_categories(*frames):
+    """
+    Convert the repeated label columns of each frame to categoricals sharing a
+    single sorted category set, so joins on them compare codes rather than strings.
+    """
+    for col in CATEGORY_COLUMNS:
+        present = [df for df in frames if col in df.columns]
+        if not present:
+            continue
+        
+        values = pd.concat([df[col] for df in present], ignore_index=True).dropna().unique()
+        dtype = pd.CategoricalDtype(pd.Index(values).sort_values())
+        for df in present:
+            df[col] = df[col].astype(dtype)
+
+def record_sort_key(column):
+    """Sort key for merged records: fight dates order chronologically, other columns as stored"""
+    if column.name == 'Date':
+        return pd.to_datetime(column, format=DATE_FORMAT, errors='coerce')
+    return column
+
+def stripped_str(series):
+    """Stripped string form of a column for value comparisons, using Arrow string kernels when available"""
+    if PYARROW_AVAILABLE:
+        return series.astype('string[pyarrow]').str.strip()
+    return series.astype(str).str.strip()
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _bytes_update_mask(latest_buf, living_buf, out_mask):
+        """Row-wise: latest bytes are not empty or b'0' and differ from living (NUL padded)"""
+        n, width = latest_buf.shape
+        for i in prange(n):
+            first = latest_buf[i, 0]
+            if first == 0 or (first == 48 and (width == 1 or latest_buf[i, 1] == 0)):
+                out_mask[i] = False
+                continue
+            differs = False
+            for j in range(width):
+                if latest_buf[i, j] != living_buf[i, j]:
+                    differs = True
+                    break
+            out_mask[i] = differs
+
+def _fixed_width_bytes(strings, width):
+    """View an array of byte strings as an (n, width) uint8 matrix, NUL padded"""
+    return strings.astype(f'S{width}').view(np.uint8).reshape(len(strings), width)
+
+def latest_has_update(latest_col, living_col):
+    """
+    Boolean array marking rows where latest has actual data (not missing, empty or '0')
+    that differs from living, comparing stripped string forms.
+    The conditions are and-ed into one array in place to keep a single mask alive.
+    """
+    latest_str = stripped_str(latest_col)
+    living_str = stripped_str(living_col)
+    mask = latest_col.notna().to_numpy(copy=True)
+    
+    if not PYARROW_AVAILABLE and NUMBA_AVAILABLE:
+        # Without Arrow strings the object-dtype comparisons box every cell;
+        # compare UTF-8 bytes in a compiled kernel instead
+        latest_bytes = np.char.encode(latest_str.to_numpy(dtype=object).astype(str), 'utf-8')
+        living_bytes = np.char.encode(living_str.to_numpy(dtype=object).astype(str), 'utf-8')
+        width = max(latest_bytes.itemsize, living_bytes.itemsize, 1)
+        differs = np.empty(len(mask), dtype=bool)
+        _bytes_update_mask(_fixed_width_bytes(latest_bytes, width),
+                           _fixed_width_bytes(living_bytes, width), differs)
+        mask &= differs
+        return mask
+    
+    mask &= ~latest_str.isin(['', '0']).to_numpy()
+    mask &= (latest_str != living_str).fillna(True).to_numpy(dtype=bool)
+    return mask
+
+def snapshot_file(src, dst):
+    """
+    Snapshot src to dst as a hardlink, falling back to a full copy when the
+    filesystem does not support links. The hardlink shares src's content at
+    no I/O cost, so src must only ever be replaced (os.replace), never
+    rewritten in place, while the snapshot is needed.
+    """
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+def living_path(data_dir, data_type):
+    """Path of the living file for a data type, preferring the Parquet store when present"""
+    parquet_file = os.path.join(data_dir, f"{data_type}_living.parquet")
+    if os.path.exists(parquet_file):
+        return parquet_file
+    return os.path.join(data_dir, f"{data_type}_living.csv")
+
+def read_living(path):
+    """Read a living file stored as Parquet or CSV"""
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return read_csv(path)
+
+def write_living_atomic(df, path):
+    """
+    Write df as Parquet or CSV (by extension) to a temporary file and swap it in,
+    leaving any hardlinked snapshot of path intact
+    """
+    tmp_file = path + '.tmp'
+    if path.endswith('.parquet'):
+        # Parquet needs a single type per column; store mixed object columns as strings
+        df = df.astype({col: 'string' for col in df.select_dtypes('object').columns})
+        df.to_parquet(tmp_file, compression='zstd', index=False)
+    else:
+        df.to_csv(tmp_file, index=False)
+    os.replace(tmp_file, path)
+
+def resolve_with_latest(living_data, latest_unique, how='outer'):
+    """
+    Join living records with the latest records on the composite key and
+    resolve the columns present in both.
+    
+    Parameters:
+    living_data (DataFrame): Living records (the whole dataset or one chunk of it)
+    latest_unique (DataFrame): Latest records, at most one per composite key
+    how (str): 'outer' to also add latest-only records, 'left' to keep only living records
+    
+    Returns:
+    tuple: (merged DataFrame with a '_merge' indicator column, number of updated records)
+    """
+    merged_data = living_data.merge(latest_unique, on=KEY_COLUMNS, how=how,
+                                    indicator=True, suffixes=('', '_latest'))
+    in_both = merged_data['_merge'] == 'both'
+    only_in_latest = merged_data['_merge'] == 'right_only'
+    
+    # Data columns are all columns except player info
+    info_columns = KEY_COLUMNS + ['Event', 'Result']
+    shared_columns = [col for col in latest_unique.columns
+                      if col not in KEY_COLUMNS and col in living_data.columns]
+    
+    # Resolve columns present in both datasets (the latest side got a suffix):
+    # 1. Records only in latest take all their values from latest
+    # 2. Common records take a data column from latest when it has new information
+    in_both = in_both.to_numpy()
+    only_in_latest = only_in_latest.to_numpy()
+    updated_rows = np.zeros(len(merged_data), dtype=bool)
+    for col in shared_columns:
+        latest_col = merged_data[col + '_latest']
+        take_latest = only_in_latest
+        
+        if col not in info_columns:
+            # Update in two cases:
+            # 1. Living data has empty/zero but latest has actual data
+            # 2. Latest data has different non-empty value (could be an update/correction)
+            # Both reduce to: latest has actual data and it differs from living
+            update = latest_has_update(latest_col, merged_data[col])
+            update &= in_both
+            updated_rows |= update
+            take_latest = take_latest | update
+        
+        if isinstance(merged_data[col].dtype, pd.CategoricalDtype):
+            merged_data[col] = merged_data[col].mask(take_latest, latest_col)
+        else:
+            merged_data[col] = np.where(take_latest, latest_col.to_numpy(), merged_data[col].to_numpy())
+        
+        # The join upcasts gaps to float; restore the dtype both files agree on
+        dtype = living_data[col].dtype
+        if dtype == latest_unique[col].dtype and merged_data[col].dtype != dtype and merged_data[col].notna().all():
+            merged_data[col] = merged_data[col].astype(dtype)
+    
+    merged_data = merged_data.drop(columns=[col + '_latest' for col in shared_columns])
+    return merged_data, int(updated_rows.sum())
+
+def merge_ufc_data(living_file, latest_file, backup=True, chunksize=None):
     """
     Merge UFC data files non-destructively, preserving historical data.
     Updates the "living" file with new data from the "latest" file.
     
     Parameters:
-    living_file (str): Path to the living UFC data CSV file (comprehensive dataset)
+    living_file (str): Path to the living UFC data CSV or Parquet file (comprehensive dataset)
     latest_file (str): Path to the latest UFC data CSV file (new scrape)
     backup (bool): Whether to create a backup of the living file before modifying
+    chunksize (int): Stream a living CSV file in chunks of this many rows to bound memory.
+        Defaults to STREAMING_CHUNKSIZE for living CSV files over STREAMING_THRESHOLD_BYTES.
     
     Returns:
     bool: True if successful
     """
-    file_type = os.path.basename(living_file).replace('_living.csv', '')
+    living_base, living_ext = os.path.splitext(living_file)
+    file_type = os.path.basename(living_base).replace('_living', '')
     print(f"\n{'='*50}")
     print(f"Processing: {file_type}")
     print(f"{'='*50}")
@@ -31,113 +238,120 @@ def merge_ufc_data(living_file, latest_file, backup=True):
             return False
             
         print(f"Living file not found. Creating initial living file from latest data.")
-        shutil.copy(latest_file, living_file)
+        if living_ext == '.parquet':
+            write_living_atomic(read_csv(latest_file), living_file)
+        else:
+            shutil.copy(latest_file, living_file)
         print(f"Created initial living file: {living_file}")
         return True
         
     # Create backup of living file if requested
     if backup:
         timestamp = datetime.now().strftime("%Y%m%d")
-        backup_file = living_file.replace('_living.csv', f'_living_{timestamp}.csv')
-        shutil.copy(living_file, backup_file)
-        print(f"Created backup: {backup_file}")
+        backup_file = f"{living_base}_{timestamp}{living_ext}"
+        
+        # Don't create duplicate backup in the same day
+        if not os.path.exists(backup_file):
+            snapshot_file(living_file, backup_file)
+            print(f"Created backup: {backup_file}")
     
-    print(f"Loading living dataset from '{living_file}'...")
-    living_data = pd.read_csv(living_file)
+    if living_ext != '.csv':
+        chunksize = None
+    elif chunksize is None and os.path.getsize(living_file) > STREAMING_THRESHOLD_BYTES:
+        chunksize = STREAMING_CHUNKSIZE
     
     print(f"Loading latest dataset from '{latest_file}'...")
-    latest_data = pd.read_csv(latest_file)
+    latest_data = read_csv(latest_file)
+    latest_unique = latest_data.drop_duplicates(KEY_COLUMNS, keep='last')
     
-    # Create composite keys for comparison
-    print("Creating composite keys for comparison...")
-    living_data['composite_key'] = living_data['Player'] + '|' + living_data['Date'].astype(str) + '|' + living_data['Opponent']
-    latest_data['composite_key'] = latest_data['Player'] + '|' + latest_data['Date'].astype(str) + '|' + latest_data['Opponent']
+    if chunksize:
+        return _merge_ufc_data_chunked(living_file, latest_data, latest_unique, chunksize)
     
-    # Find records in both datasets
-    living_keys = set(living_data['composite_key'])
-    latest_keys = set(latest_data['composite_key'])
-    common_keys = living_keys.intersection(latest_keys)
+    print(f"Loading living dataset from '{living_file}'...")
+    living_data = read_living(living_file)
+    align_categories(living_data, latest_data)
+    latest_unique = latest_data.drop_duplicates(KEY_COLUMNS, keep='last')
     
-    # Records unique to each dataset
-    only_in_living = living_keys - latest_keys
-    only_in_latest = latest_keys - living_keys
+    # Join both datasets on the composite key; the indicator column tells
+    # which records are in both, only in living, or only in latest
+    print("Joining datasets on composite keys for comparison...")
+    merged_data, updated_count = resolve_with_latest(living_data, latest_unique, how='outer')
     
     print(f"Total records in living data: {len(living_data)}")
     print(f"Total records in latest data: {len(latest_data)}")
-    print(f"Records in both datasets: {len(common_keys)}")
-    print(f"Records only in living dataset: {len(only_in_living)}")
-    print(f"Records only in latest dataset: {len(only_in_latest)}")
-    
-    # Prepare for the merge
-    # 1. Start with all records from living dataset
-    print("Starting with living dataset as base...")
-    merged_data = living_data.copy()
-    
-    # 2. Add records that only exist in the latest dataset
-    print(f"Adding {len(only_in_latest)} new records from latest dataset...")
-    records_to_add = latest_data[latest_data['composite_key'].isin(only_in_latest)]
-    merged_data = pd.concat([merged_data, records_to_add], ignore_index=True)
-    
-    # 3. For records in both datasets, check if latest data has new information
-    if len(common_keys) > 0:
-        print("Updating common records with any new information...")
-        
-        # Data columns are all columns except player info
-        key_columns = ['Player', 'Date', 'Opponent', 'Event', 'Result', 'composite_key']
-        data_columns = [col for col in latest_data.columns if col not in key_columns]
-        
-        # Create a lookup dictionary for faster access to latest records
-        latest_records_dict = {}
-        for _, row in latest_data.iterrows():
-            latest_records_dict[row['composite_key']] = row
-        
-        updated_count = 0
+    print(f"Records in both datasets: {(merged_data['_merge'] == 'both').sum()}")
+    print(f"Records only in living dataset: {(merged_data['_merge'] == 'left_only').sum()}")
+    print(f"Records only in latest dataset: {(merged_data['_merge'] == 'right_only').sum()}")
+    print(f"Updated {updated_count} existing records with new information")
+    
+    merged_data = merged_data.drop(columns='_merge')
+    
+    # Sort the data for better organization
+    # (Player is categorical, so this compares int codes; Date is parsed once for ordering only)
+    merged_data = merged_data.sort_values(by=['Player', 'Date'], ascending=[True, False], kind='stable',
+                                          ignore_index=True, key=record_sort_key)
+    
+    # Save the merged data
+    print(f"Saving updated living data to '{living_file}'...")
+    write_living_atomic(merged_data, living_file)
+    
+    print(f"Update completed successfully. Total records in living dataset: {len(merged_data)}")
+    return True
+
+def _merge_ufc_data_chunked(living_file, latest_data, latest_unique, chunksize):
+    """
+    Streaming variant of merge_ufc_data: patches the living file chunk by chunk
+    into a temporary file, then appends the records only in latest. Only the
+    latest data and one living chunk are held in memory at a time, so the
+    output keeps the living file's order instead of being re-sorted.
+    """
+    print(f"Streaming living dataset from '{living_file}' in chunks of {chunksize} rows...")
+    tmp_file = living_file + '.tmp'
+    columns = None
+    matched_keys = []
+    living_count = common_count = updated_count = total_count = 0
+    
+    for chunk in pd.read_csv(living_file, chunksize=chunksize):
+        merged_chunk, chunk_updated = resolve_with_latest(chunk, latest_unique, how='left')
+        in_both = merged_chunk['_merge'] == 'both'
+        matched_keys.append(pd.MultiIndex.from_frame(merged_chunk.loc[in_both, KEY_COLUMNS]))
+        merged_chunk = merged_chunk.drop(columns='_merge')
         
-        # Process through common records in living dataset
-        for index, living_row in merged_data[merged_data['composite_key'].isin(common_keys)].iterrows():
-            key = living_row['composite_key']
-            latest_row = latest_records_dict.get(key)
-            
-            if latest_row is not None:
-                # Check each data column
-                update_needed = False
-                for col in data_columns:
-                    if col in latest_row and col in living_row:
-                        # If latest data has non-empty/non-zero value but living has empty
-                        latest_value = str(latest_row[col]).strip()
-                        living_value = str(living_row[col]).strip()
-                        
-                        # Update in two cases:
-                        # 1. Living data has empty/zero but latest has actual data
-                        # 2. Latest data has different non-empty value (could be an update/correction)
-                        if ((living_value == '' or living_value == '0' or pd.isna(living_row[col])) and
-                            (latest_value != '' and latest_value != '0' and not pd.isna(latest_row[col]))) or \
-                           (latest_value != living_value and 
-                            latest_value != '' and latest_value != '0' and not pd.isna(latest_row[col])):
-                            # Use the latest data
-                            merged_data.at[index, col] = latest_row[col]
-                            update_needed = True
-                
-                if update_needed:
-                    updated_count += 1
+        if columns is None:
+            columns = list(merged_chunk.columns)
+        merged_chunk.to_csv(tmp_file, index=False, mode='w' if total_count == 0 else 'a',
+                            header=total_count == 0)
         
-        print(f"Updated {updated_count} existing records with new information")
+        living_count += len(chunk)
+        common_count += int(in_both.sum())
+        updated_count += chunk_updated
+        total_count += len(merged_chunk)
     
-    # 4. Clean up - remove the composite key column
-    merged_data = merged_data.drop('composite_key', axis=1)
+    # Records only in latest are the latest keys no living chunk matched
+    latest_keys = pd.MultiIndex.from_frame(latest_unique[KEY_COLUMNS])
+    matched = matched_keys[0].append(matched_keys[1:]) if matched_keys else latest_keys[:0]
+    records_to_add = latest_unique[~latest_keys.isin(matched)]
+    if columns is not None:
+        records_to_add = records_to_add.reindex(columns=columns)
+    records_to_add.to_csv(tmp_file, index=False, mode='w' if total_count == 0 else 'a',
+                          header=total_count == 0)
+    total_count += len(records_to_add)
     
-    # 5. Sort the data for better organization
-    merged_data = merged_data.sort_values(by=['Player', 'Date'], ascending=[True, False])
+    print(f"Total records in living data: {living_count}")
+    print(f"Total records in latest data: {len(latest_data)}")
+    print(f"Records in both datasets: {common_count}")
+    print(f"Records only in living dataset: {living_count - common_count}")
+    print(f"Records only in latest dataset: {len(records_to_add)}")
+    print(f"Updated {updated_count} existing records with new information")
     
-    # 6. Save the merged data
     print(f"Saving updated living data to '{living_file}'...")
-    merged_data.to_csv(living_file, index=False)
+    os.replace(tmp_file, living_file)
     
-    print(f"Update completed successfully. Total records in living dataset: {len(merged_data)}")
+    print(f"Update completed successfully. Total records in living dataset: {total_count}")
     return True
 
 
-def batch_process_ufc_data(data_dir='.'):
+def batch_process_ufc_data(data_dir='.', chunksize=None):
     """
     Process all UFC data files in the given directory.
     For each data type (ground, clinch, striking), merges:
@@ -145,25 +359,34 @@ def batch_process_ufc_data(data_dir='.'):
     
     Parameters:
     data_dir (str): Directory containing the UFC data files
+    chunksize (int): Stream living files in chunks of this many rows (see merge_ufc_data)
     
     Returns:
     list: List of successfully processed data types
     """
-    success_list = []
+    jobs = {}
     
     for data_type in DATA_TYPES:
         latest_file = os.path.join(data_dir, f"{data_type}_latest.csv")
-        living_file = os.path.join(data_dir, f"{data_type}_living.csv")
+        living_file = living_path(data_dir, data_type)
         
         # Check if latest file exists
         if os.path.exists(latest_file):
-            success = merge_ufc_data(living_file, latest_file)
-            if success:
-                success_list.append(data_type)
+            jobs[data_type] = (living_file, latest_file)
         else:
             print(f"Warning: Latest file not found - {latest_file}")
     
-    return success_list
+    if not jobs:
+        return []
+    
+    # The data types are independent files, so merge them in separate processes
+    # (CSV parsing and merging hold the GIL, so threads would not overlap)
+    with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = {
+            data_type: executor.submit(merge_ufc_data, living_file, latest_file, chunksize=chunksize)
+            for data_type, (living_file, latest_file) in jobs.items()
+        }
+        return [data_type for data_type, future in futures.items() if future.result()]
 
 
 def rename_current_to_latest(data_dir='.'):
@@ -214,6 +437,35 @@ def rename_original_to_living(data_dir='.'):
     return renamed
 
 
+def migrate_living_to_parquet(data_dir='.'):
+    """
+    Convert each data_living.csv to data_living.parquet (zstd-compressed).
+    Once present, the Parquet file is used as the living store instead of the CSV,
+    which is left in place untouched.
+    """
+    if not PYARROW_AVAILABLE:
+        print("Error: pyarrow is required for Parquet living files (pip install pyarrow)")
+        return []
+    
+    migrated = []
+    
+    for data_type in DATA_TYPES:
+        csv_file = os.path.join(data_dir, f"{data_type}_living.csv")
+        parquet_file = os.path.join(data_dir, f"{data_type}_living.parquet")
+        
+        if os.path.exists(csv_file):
+            if os.path.exists(parquet_file):
+                overwrite = input(f"{parquet_file} already exists. Overwrite? (y/n): ").lower()
+                if overwrite != 'y':
+                    continue
+            
+            write_living_atomic(read_csv(csv_file), parquet_file)
+            migrated.append(data_type)
+            print(f"Migrated: {csv_file} → {parquet_file}")
+    
+    return migrated
+
+
 if __name__ == "__main__":
     print("UFC Data Merger - Living Database Approach")
     print("="*60)
@@ -222,12 +474,14 @@ if __name__ == "__main__":
     print("\nNaming convention:")
     print("- data_latest.csv: Your most recent scrape")
     print("- data_living.csv: Comprehensive dataset that grows over time")
+    print("- data_living.parquet: Optional compressed living store, used instead of the CSV when present")
     print("\nOptions:")
     print("1. Process all UFC data files (merge _latest into _living)")
     print("2. Convert from old naming convention to new")
-    print("3. Quit")
+    print("3. Migrate living files to Parquet")
+    print("4. Quit")
     
-    choice = input("\nSelect an option (1-3): ")
+    choice = input("\nSelect an option (1-4): ")
     
     if choice == '1':
         data_dir = input("Enter directory containing UFC data files (default: current): ")
@@ -269,5 +523,16 @@ if __name__ == "__main__":
                 
             print("\nConversion completed.")
     
+    elif choice == '3':
+        data_dir = input("Enter directory containing UFC data files (default: current): ")
+        if not data_dir:
+            data_dir = '.'
+            
+        if not os.path.exists(data_dir):
+            print(f"Error: Directory not found: {data_dir}")
+        else:
+            migrated = migrate_living_to_parquet(data_dir)
+            print(f"\nMigrated {len(migrated)} living files to Parquet.")
+    
     else:
         print("Exiting.")
\ No newline at end of file
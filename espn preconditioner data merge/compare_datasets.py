@@ -19,11 +19,28 @@ Options:
 import os
 import sys
 import glob
+import heapq
 import argparse
 from datetime import datetime
 import pandas as pd
 from tabulate import tabulate
 
+try:
+    import pyarrow
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Parsed datasets keyed by (path, mtime_ns, size), so files matched by
+# several patterns in one run are only read once
+_csv_cache = {}
+
+def read_csv(path):
+    """Read a CSV file, using the multithreaded pyarrow parser when installed"""
+    if PYARROW_AVAILABLE:
+        return pd.read_csv(path, engine='pyarrow')
+    return pd.read_csv(path)
+
 def load_datasets(file_pattern):
     """
     Load all datasets matching the specified pattern.
@@ -43,13 +60,24 @@ def load_datasets(file_pattern):
         
     for file in files:
         try:
-            df = pd.read_csv(file)
+            st = os.stat(file)
+            cache_key = (file, st.st_mtime_ns, st.st_size)
+            df = _csv_cache.get(cache_key)
+            if df is not None:
+                datasets[file] = df
+                continue
+            
+            df = read_csv(file)
             
             # Check if the dataset has a 'Player' column (UFC data uses 'Player' not 'Name')
             if 'Player' not in df.columns:
                 print(f"Warning: '{file}' does not have a 'Player' column. Skipping.")
                 continue
                 
+            # Fighter names repeat once per fight; hash them as category codes
+            df['Player'] = df['Player'].astype('category')
+            
+            _csv_cache[cache_key] = df
             datasets[file] = df
             
         except Exception as e:
@@ -57,27 +85,40 @@ def load_datasets(file_pattern):
     
     return datasets
 
-def find_unique_fighters(datasets):
+def get_player_sets(datasets):
+    """
+    Compute the set of fighter names in each dataset once.
+    
+    Args:
+        datasets: Dictionary of dataframes
+        
+    Returns:
+        Dictionary mapping filenames to sets of fighter names
+    """
+    return {filename: set(df['Player'].unique()) for filename, df in datasets.items()}
+
+def find_unique_fighters(datasets, player_sets=None):
     """
     Find all unique fighters across all datasets.
     
     Args:
         datasets: Dictionary of dataframes
+        player_sets: Precomputed fighter sets from get_player_sets (optional)
         
     Returns:
         Set of unique fighter names
     """
-    all_fighters = set()
-    for df in datasets.values():
-        all_fighters.update(df['Player'].unique())
-    return all_fighters
+    if player_sets is None:
+        player_sets = get_player_sets(datasets)
+    return set().union(*player_sets.values())
 
-def analyze_datasets(datasets):
+def analyze_datasets(datasets, player_sets=None):
     """
     Analyze datasets and calculate completeness scores.
     
     Args:
         datasets: Dictionary of dataframes
+        player_sets: Precomputed fighter sets from get_player_sets (optional)
         
     Returns:
         Dictionary with analysis results
@@ -86,20 +127,23 @@ def analyze_datasets(datasets):
         return {}
         
     results = {}
-    all_fighters = find_unique_fighters(datasets)
+    if player_sets is None:
+        player_sets = get_player_sets(datasets)
+    all_fighters = find_unique_fighters(datasets, player_sets)
     
     # Calculate statistics for each dataset
     for filename, df in datasets.items():
-        file_fighters = set(df['Player'].unique())
+        file_fighters = player_sets[filename]
         missing_fighters = all_fighters - file_fighters
         
         # Calculate completion score (higher is better)
         # Score = fighters * columns * records
         score = len(file_fighters) * len(df.columns) * len(df)
         
+        st = os.stat(filename)
         results[filename] = {
-            'file_size': os.path.getsize(filename),
-            'timestamp': datetime.fromtimestamp(os.path.getmtime(filename)),
+            'file_size': st.st_size,
+            'timestamp': datetime.fromtimestamp(st.st_mtime),
             'fighter_count': len(file_fighters),
             'column_count': len(df.columns),
             'record_count': len(df),
@@ -172,15 +216,15 @@ def print_comparison(results, all_fighters, verbose=False):
             if missing > 0:
                 print(f"\n{os.path.basename(filename)} is missing {missing} fighters:")
                 if verbose:
-                    for i, fighter in enumerate(sorted(stats['missing_fighters'])):
+                    # Only the first 10 names are shown, so avoid sorting the whole set
+                    for fighter in heapq.nsmallest(10, stats['missing_fighters']):
                         print(f"  - {fighter}")
-                        if i >= 9 and len(stats['missing_fighters']) > 10:
-                            print(f"  ... and {len(stats['missing_fighters']) - 10} more")
-                            break
+                    if len(stats['missing_fighters']) > 10:
+                        print(f"  ... and {len(stats['missing_fighters']) - 10} more")
     
     return recommended
 
-def create_master_file(datasets, results, all_fighters, output_file=None):
+def create_master_file(datasets, results, all_fighters, output_file=None, player_sets=None):
     """
     Create a master file combining all datasets.
     
@@ -189,6 +233,7 @@ def create_master_file(datasets, results, all_fighters, output_file=None):
         results: Dictionary with analysis results
         all_fighters: Set of all unique fighter names
         output_file: Output file path
+        player_sets: Precomputed fighter sets from get_player_sets (optional)
         
     Returns:
         Path to the created master file
@@ -196,6 +241,9 @@ def create_master_file(datasets, results, all_fighters, output_file=None):
     if not datasets or not results:
         return None
     
+    if player_sets is None:
+        player_sets = get_player_sets(datasets)
+    
     # Start with the most complete dataset
     sorted_results = sorted(
         results.items(), 
@@ -214,29 +262,41 @@ def create_master_file(datasets, results, all_fighters, output_file=None):
         output_file = f"{data_type}_data_master.csv"
     
     # Add fighters from other datasets that are missing from the base dataset
-    base_fighters = set(master_df['Player'].unique())
+    base_fighters = player_sets[base_file]
     missing_fighters = all_fighters - base_fighters
+    still_missing = set(missing_fighters)
     
     if missing_fighters:
         print(f"\nAdding {len(missing_fighters)} fighters missing from the base file...")
         
-        # For each missing fighter, find them in other datasets and add their records
-        for fighter in missing_fighters:
-            for filename, df in datasets.items():
-                if filename == base_file:
-                    continue
-                    
-                fighter_records = df[df['Player'] == fighter]
-                if not fighter_records.empty:
-                    # Add these records to the master dataframe
-                    master_df = pd.concat([master_df, fighter_records], ignore_index=True)
-                    print(f"  - Added {fighter} (found in {os.path.basename(filename)})")
-                    break
+        # Collect records to add and concatenate once, rather than per fighter
+        extras = []
+        
+        # Take each missing fighter from the first other dataset that has them
+        for filename, df in datasets.items():
+            if filename == base_file:
+                continue
+            
+            take = still_missing & player_sets[filename]
+            if not take:
+                continue
+            
+            extras.append(df[df['Player'].isin(take)])
+            for fighter in take:
+                print(f"  - Added {fighter} (found in {os.path.basename(filename)})")
+            
+            still_missing -= take
+            if not still_missing:
+                break
+        
+        if extras:
+            master_df = pd.concat([master_df, *extras], ignore_index=True)
     
     # Save the master file
     master_df.to_csv(output_file, index=False)
     print(f"\nCreated master file: {output_file}")
-    print(f"The master file contains {len(master_df['Player'].unique())} unique fighters "
+    master_fighter_count = len(base_fighters) + len(missing_fighters) - len(still_missing)
+    print(f"The master file contains {master_fighter_count} unique fighters "
           f"and {len(master_df.columns)} columns.")
     
     return output_file
@@ -265,18 +325,19 @@ def main():
     print(f"Found {len(datasets)} datasets to compare.")
     
     # Find all unique fighters
-    all_fighters = find_unique_fighters(datasets)
+    player_sets = get_player_sets(datasets)
+    all_fighters = find_unique_fighters(datasets, player_sets)
     print(f"Found {len(all_fighters)} unique fighters across all datasets.")
     
     # Analyze datasets
-    results = analyze_datasets(datasets)
+    results = analyze_datasets(datasets, player_sets)
     
     # Print comparison results
     recommended = print_comparison(results, all_fighters, args.verbose)
     
     # Create master file if requested
     if args.create_master and recommended:
-        create_master_file(datasets, results, all_fighters, args.output)
+        create_master_file(datasets, results, all_fighters, args.output, player_sets)
     
     return 0
 
@@ -16,7 +16,6 @@ import os
 import sys
 import shutil
 import argparse
-import subprocess
 import glob
 from datetime import datetime
 
@@ -97,15 +96,21 @@ def create_master_dataset(data_type, verbose=False):
     # Run the comparison script to create a master file
     print(f"\nComparing all {data_type} files...")
     master_file = f"{data_type}_master.csv"
-    cmd = ["python", "compare_datasets.py", "--pattern", f"{data_type}*.csv", "--create-master", "--output", master_file]
-    
-    if verbose:
-        cmd.append("--verbose")
     
     try:
-        subprocess.run(cmd, check=True)
-    except subprocess.CalledProcessError:
-        print(f"Error: Failed to compare {data_type} files and create master file")
+        import compare_datasets as cd
+        
+        datasets = cd.load_datasets(f"{data_type}*.csv")
+        if not datasets:
+            raise ValueError("no valid datasets found")
+        
+        player_sets = cd.get_player_sets(datasets)
+        all_fighters = cd.find_unique_fighters(datasets, player_sets)
+        results = cd.analyze_datasets(datasets, player_sets)
+        if cd.print_comparison(results, all_fighters, verbose):
+            cd.create_master_file(datasets, results, all_fighters, master_file, player_sets)
+    except Exception as e:
+        print(f"Error: Failed to compare {data_type} files and create master file: {str(e)}")
         return False
     
     # Check if master file was created
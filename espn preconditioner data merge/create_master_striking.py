@@ -2,7 +2,7 @@
 """
 Create Master Striking Data File
 
-This script is a simple wrapper around compare_datasets.py that:
+This script is a simple wrapper around the compare_datasets module that:
 1. Compares all striking_*.csv files in the current directory
 2. Creates a master striking data file with all fighter data combined
 3. Renames the master file to striking_data_living.csv
@@ -14,7 +14,6 @@ even those who have been purged by ESPN.
 import os
 import sys
 import shutil
-import subprocess
 from datetime import datetime
 
 def check_dependencies():
@@ -77,12 +76,20 @@ def main():
     
     # Run the comparison script to create a master file
     print("\nComparing all striking data files...")
-    cmd = ["python", "compare_datasets.py", "--pattern", "striking_*.csv", "--create-master", "--output", "striking_data_master.csv"]
-    
     try:
-        subprocess.run(cmd, check=True)
-    except subprocess.CalledProcessError:
-        print("Error: Failed to compare datasets and create master file")
+        import compare_datasets as cd
+        
+        datasets = cd.load_datasets("striking_*.csv")
+        if not datasets:
+            raise ValueError("no valid datasets found")
+        
+        player_sets = cd.get_player_sets(datasets)
+        all_fighters = cd.find_unique_fighters(datasets, player_sets)
+        results = cd.analyze_datasets(datasets, player_sets)
+        if cd.print_comparison(results, all_fighters):
+            cd.create_master_file(datasets, results, all_fighters, "striking_data_master.csv", player_sets)
+    except Exception as e:
+        print(f"Error: Failed to compare datasets and create master file: {str(e)}")
         return 1
     
     # Check if master file was created
@@ -6,20 +6,18 @@ This script demonstrates various ways to use the UFC Data Merger
 
 import os
 import sys
-import subprocess
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
-def run_command(command):
-    """Run a command and print its output"""
-    print(f"\n> {command}")
-    result = subprocess.run(command, shell=True, capture_output=True, text=True)
-    if result.stdout:
-        print(result.stdout)
-    if result.stderr:
-        print(f"Error: {result.stderr}")
-    return result.returncode
+def run_merger(merger_main, *args):
+    """Run the merger in-process with the given arguments, echoing the equivalent command"""
+    print(f"\n> python ../postscrapemerge.py {' '.join(args)}".rstrip())
+    try:
+        return merger_main(list(args))
+    except SystemExit as e:
+        # argparse exits after --help or on invalid arguments
+        return e.code
 
 def create_sample_data():
     """Create sample data files for demonstration"""
@@ -77,6 +75,8 @@ def main():
         print("Error: postscrapemerge.py not found in current directory")
         return 1
     
+    from postscrapemerge import main as merger_main
+    
     # Create sample data
     create_sample_data()
     
@@ -87,37 +87,37 @@ def main():
     print("\n" + "=" * 50)
     print("EXAMPLE 1: Basic usage - merge all available data")
     print("=" * 50)
-    run_command("python ../postscrapemerge.py")
+    run_merger(merger_main)
     
     print("\n" + "=" * 50)
     print("EXAMPLE 2: Dry run mode - preview changes without modifying files")
     print("=" * 50)
-    run_command("python ../postscrapemerge.py --dry-run")
+    run_merger(merger_main, "--dry-run")
     
     print("\n" + "=" * 50)
     print("EXAMPLE 3: Process only specific data types")
     print("=" * 50)
-    run_command("python ../postscrapemerge.py --types ground_data")
+    run_merger(merger_main, "--types", "ground_data")
     
     print("\n" + "=" * 50)
     print("EXAMPLE 4: Skip backup creation")
     print("=" * 50)
-    run_command("python ../postscrapemerge.py --no-backup")
+    run_merger(merger_main, "--no-backup")
     
     print("\n" + "=" * 50)
     print("EXAMPLE 5: Force merge even with validation issues")
     print("=" * 50)
-    run_command("python ../postscrapemerge.py --types striking_data --force")
+    run_merger(merger_main, "--types", "striking_data", "--force")
     
     print("\n" + "=" * 50)
     print("EXAMPLE 6: Verbose mode for more detailed logs")
     print("=" * 50)
-    run_command("python ../postscrapemerge.py --verbose")
+    run_merger(merger_main, "--verbose")
     
     print("\n" + "=" * 50)
     print("EXAMPLE 7: Show help information")
     print("=" * 50)
-    run_command("python ../postscrapemerge.py --help")
+    run_merger(merger_main, "--help")
     
     # Go back to original directory
     os.chdir("..")
@@ -1,29 +1,132 @@
+import numpy as np
 import pandas as pd
 import os
 import shutil
 import argparse
 import logging
+import logging.handlers
 from datetime import datetime
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 # UFC data file types
 DATA_TYPES = ['ground_data', 'clinch_data', 'striking_data']
 
+# Columns identifying a fighter record, and the columns every data file must have
+KEY_COLS = ('Name', 'Division Title')
+REQUIRED_COLS = frozenset(KEY_COLS)
+
+# Low-cardinality label columns held as categoricals, so dedup and grouping hash int codes
+CATEGORICAL_COLS = ('Division Title', 'Status', 'Fighting_style')
+
+def read_csv(path):
+    """
+    Read a CSV file, using Arrow's multithreaded reader into Arrow-backed columns
+    when pyarrow is installed. Columns Arrow would infer as times or dates
+    (e.g. "09:23") stay strings so they are written back unchanged.
+    """
+    if not PYARROW_AVAILABLE:
+        return pd.read_csv(path)
+    
+    schema = pacsv.open_csv(path).schema
+    text_columns = {field.name: pa.string() for field in schema if pa.types.is_temporal(field.type)}
+    table = pacsv.read_csv(path, convert_options=pacsv.ConvertOptions(column_types=text_columns))
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+def categorize_labels(df):
+    """Convert the CATEGORICAL_COLS present in df to categoricals (written back as their labels)"""
+    for col in CATEGORICAL_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+def count_csv_rows(path):
+    """
+    Count the data rows of a CSV file from its line breaks, without parsing it.
+    Assumes no quoted field spans several lines, which holds for the scraped data.
+    """
+    lines = 0
+    last_chunk = b''
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            lines += chunk.count(b'\n')
+            last_chunk = chunk
+    
+    # A final line without a trailing newline is still a row
+    if last_chunk and not last_chunk.endswith(b'\n'):
+        lines += 1
+    
+    # Exclude the header
+    return max(lines - 1, 0)
+
 # Set up logging
-def setup_logging(log_level=logging.INFO):
-    """Configure logging for the application"""
+def setup_logging(log_level=logging.INFO, run_stamp=None):
+    """Configure logging for the application, logging to merge_log_<run_stamp>.log"""
+    if run_stamp is None:
+        run_stamp = datetime.now().strftime('%Y%m%d')
     log_format = '%(asctime)s - %(levelname)s - %(message)s'
+    
+    # Buffer file records and write them in batches; errors flush immediately
+    file_handler = logging.FileHandler(f"merge_log_{run_stamp}.log", delay=True)
+    file_handler.setFormatter(logging.Formatter(log_format))
+    buffered_handler = logging.handlers.MemoryHandler(
+        capacity=1024, flushLevel=logging.ERROR, target=file_handler, flushOnClose=True
+    )
+    
     logging.basicConfig(
         level=log_level,
         format=log_format,
         handlers=[
             logging.StreamHandler(),
-            logging.FileHandler(f"merge_log_{datetime.now().strftime('%Y%m%d')}.log")
-        ]
+            buffered_handler
+        ],
+        force=True  # main() may run several times in one process (see example_usage.py)
     )
     return logging.getLogger(__name__)
 
+def file_exists(path, present=None):
+    """Check whether path exists, using a set of directory entry names when one is given"""
+    if present is None:
+        return os.path.exists(path)
+    return path in present
+
+def snapshot_file(src, dst):
+    """
+    Snapshot src to dst as a hardlink, falling back to a full copy when the
+    filesystem does not support links. The link shares src's bytes at no I/O
+    cost, so src must only be replaced (see write_csv_atomic), never rewritten in place.
+    """
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        pass
+    except OSError:
+        shutil.copy(src, dst)
+
+def write_csv_atomic(df, path):
+    """Write df to a temporary file and swap it in, leaving hardlinked snapshots of path intact"""
+    tmp_file = path + '.tmp'
+    if PYARROW_AVAILABLE:
+        # Arrow's C++ writer formats whole columns instead of each cell in Python
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pacsv.write_csv(table, tmp_file, write_options=pacsv.WriteOptions(quoting_style='needed'))
+    else:
+        df.to_csv(tmp_file, index=False)
+    os.replace(tmp_file, path)
+
+class DataTypeAdapter(logging.LoggerAdapter):
+    """Prefix log messages with the data type, so merges running in parallel stay readable"""
+    def process(self, msg, kwargs):
+        return f"[{self.extra['data_type']}] {msg}", kwargs
+
 def validate_data(df, data_type):
     """
     Perform basic validation on data frames to ensure data quality
@@ -40,21 +143,22 @@ def validate_data(df, data_type):
         return False, f"Error: {data_type} DataFrame is empty"
         
     # Check for minimum required columns based on data type
-    required_columns = ['Name', 'Division Title']
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    missing_columns = REQUIRED_COLS.difference(df.columns)
     
     if missing_columns:
-        return False, f"Error: {data_type} missing required columns: {missing_columns}"
+        return False, f"Error: {data_type} missing required columns: {sorted(missing_columns)}"
     
-    # Check for duplicate fighters (same Name and Division Title)
-    duplicate_mask = df.duplicated(subset=['Name', 'Division Title'], keep=False)
-    if duplicate_mask.any():
-        duplicates = df[duplicate_mask]['Name'].unique().tolist()
-        return False, f"Warning: {data_type} contains {len(duplicates)} fighters with duplicated entries"
+    # Check for duplicate fighters (same Name and Division Title) in one grouping pass
+    counts = df.groupby(list(KEY_COLS), sort=False, observed=True, dropna=False).size()
+    duplicates = counts[counts > 1]
+    if not duplicates.empty:
+        duplicate_names = duplicates.index.get_level_values('Name').unique()
+        return False, f"Warning: {data_type} contains {len(duplicate_names)} fighters with duplicated entries"
     
     return True, f"{data_type} data validation passed"
 
-def merge_ufc_data(living_file, latest_file, backup=True, force=False, dry_run=False):
+def merge_ufc_data(living_file, latest_file, backup=True, force=False, dry_run=False, run_stamp=None,
+                   present=None):
     """
     Merge UFC data files non-destructively, preserving historical data.
     Updates the "living" file with new data from the "latest" file.
@@ -65,15 +169,19 @@ def merge_ufc_data(living_file, latest_file, backup=True, force=False, dry_run=F
     backup (bool): Whether to create a backup of the living file before modifying
     force (bool): Whether to proceed even if validation fails
     dry_run (bool): If True, performs all operations except actual file writing
+    run_stamp (str): Date stamp (YYYYMMDD) for backup names, defaults to today
+    present (set): Names of the files in the current directory, from one scan; when
+        given, existence checks are answered from it instead of stat calls
     
     Returns:
     dict: Statistics and information about the operation
     """
     file_type = os.path.basename(living_file).replace('_living.csv', '')
+    log = DataTypeAdapter(logger, {'data_type': file_type})
     
-    logger.info(f"{'='*50}")
-    logger.info(f"Processing: {file_type}")
-    logger.info(f"{'='*50}")
+    log.info(f"{'='*50}")
+    log.info(f"Processing: {file_type}")
+    log.info(f"{'='*50}")
     
     result_stats = {
         'file_type': file_type,
@@ -89,130 +197,147 @@ def merge_ufc_data(living_file, latest_file, backup=True, force=False, dry_run=F
     }
     
     # Check if this is the first time (living file doesn't exist yet)
-    if not os.path.exists(living_file):
-        if not os.path.exists(latest_file):
-            logger.error(f"Error: Latest file not found - {latest_file}")
+    if not file_exists(living_file, present):
+        if not file_exists(latest_file, present):
+            log.error(f"Error: Latest file not found - {latest_file}")
             result_stats['error'] = f"Latest file not found - {latest_file}"
             return result_stats
             
-        logger.info(f"Living file not found. Creating initial living file from latest data.")
+        log.info(f"Living file not found. Creating initial living file from latest data.")
         
         if not dry_run:
             shutil.copy(latest_file, living_file)
-            logger.info(f"Created initial living file: {living_file}")
+            log.info(f"Created initial living file: {living_file}")
         else:
-            logger.info(f"DRY RUN: Would create initial living file: {living_file}")
+            log.info(f"DRY RUN: Would create initial living file: {living_file}")
         
         result_stats['status'] = 'success'
-        result_stats['new_records'] = len(pd.read_csv(latest_file))
+        result_stats['new_records'] = count_csv_rows(latest_file)
         result_stats['total_records'] = result_stats['new_records']
         result_stats['new_unique_records'] = result_stats['new_records']
         return result_stats
         
     # Create backup of living file if requested
+    if run_stamp is None:
+        run_stamp = datetime.now().strftime("%Y%m%d")
+    backup_file = living_file.replace('_living.csv', f'_living_{run_stamp}.csv')
+    
     if backup and not dry_run:
-        timestamp = datetime.now().strftime("%Y%m%d")
-        backup_file = living_file.replace('_living.csv', f'_living_{timestamp}.csv')
-        
         # Don't create duplicate backup in the same day
-        if not os.path.exists(backup_file):
-            shutil.copy(living_file, backup_file)
-            logger.info(f"Created backup: {backup_file}")
+        if not file_exists(backup_file, present):
+            snapshot_file(living_file, backup_file)
+            log.info(f"Created backup: {backup_file}")
             result_stats['backup_created'] = backup_file
     elif backup and dry_run:
-        timestamp = datetime.now().strftime("%Y%m%d")
-        backup_file = living_file.replace('_living.csv', f'_living_{timestamp}.csv')
-        logger.info(f"DRY RUN: Would create backup: {backup_file}")
+        log.info(f"DRY RUN: Would create backup: {backup_file}")
         result_stats['backup_created'] = f"Would create: {backup_file}"
     
     try:
-        logger.info(f"Loading living dataset from '{living_file}'...")
-        living_data = pd.read_csv(living_file)
+        log.info(f"Loading living dataset from '{living_file}'...")
+        living_data = categorize_labels(read_csv(living_file))
         result_stats['previous_records'] = len(living_data)
         
         # Validate living data
         is_valid, message = validate_data(living_data, f"{file_type} (living)")
         if not is_valid and not force:
-            logger.error(message)
+            log.error(message)
             result_stats['error'] = message
             return result_stats
         elif not is_valid:
-            logger.warning(f"{message} - continuing due to --force flag")
+            log.warning(f"{message} - continuing due to --force flag")
         
-        if not os.path.exists(latest_file):
-            logger.warning(f"Latest file not found - {latest_file}. Using existing living data.")
+        if not file_exists(latest_file, present):
+            log.warning(f"Latest file not found - {latest_file}. Using existing living data.")
             result_stats['status'] = 'skipped'
             result_stats['error'] = f"Latest file not found - {latest_file}"
             return result_stats
             
-        logger.info(f"Loading latest dataset from '{latest_file}'...")
-        latest_data = pd.read_csv(latest_file)
+        log.info(f"Loading latest dataset from '{latest_file}'...")
+        latest_data = categorize_labels(read_csv(latest_file))
         result_stats['new_records'] = len(latest_data)
         
         # Validate latest data
         is_valid, message = validate_data(latest_data, f"{file_type} (latest)")
         if not is_valid and not force:
-            logger.error(message)
+            log.error(message)
             result_stats['error'] = message
             return result_stats
         elif not is_valid:
-            logger.warning(f"{message} - continuing due to --force flag")
+            log.warning(f"{message} - continuing due to --force flag")
         
         # Identify fighters present in living data but not in latest data (purged fighters)
-        living_fighters = set(living_data['Name'].unique())
-        latest_fighters = set(latest_data['Name'].unique())
-        purged_fighters = living_fighters - latest_fighters
+        # Names from both files are factorized to shared integer codes once, so the
+        # set operations below run on ints in NumPy rather than re-hashing strings
+        all_names = pd.concat([living_data['Name'], latest_data['Name']], ignore_index=True)
+        codes, names = pd.factorize(all_names, use_na_sentinel=False)
+        living_codes = codes[:len(living_data)]
+        living_fighter_codes = np.unique(living_codes)
+        latest_fighter_codes = np.unique(codes[len(living_data):])
+        purged_codes = np.setdiff1d(living_fighter_codes, latest_fighter_codes, assume_unique=True)
+        purged_fighters = names.take(purged_codes)
         
-        if purged_fighters:
-            logger.info(f"Found {len(purged_fighters)} fighters in living data not present in latest data")
-            logger.info(f"These fighters will be preserved (they may have been purged by ESPN)")
+        if len(purged_fighters) > 0:
+            log.info(f"Found {len(purged_fighters)} fighters in living data not present in latest data")
+            log.info(f"These fighters will be preserved (they may have been purged by ESPN)")
             
-            # Extract purged fighter data
-            purged_data = living_data[living_data['Name'].isin(purged_fighters)]
+            # Extract purged fighter data, keeping the living file's row order
+            purged_data = living_data.iloc[np.isin(living_codes, purged_codes)]
             result_stats['preserved_records'] = len(purged_data)
             
             # Log some of the preserved fighters (up to 5) for verification
-            sample_fighters = list(purged_fighters)[:5]
+            sample_fighters = purged_fighters[:5].tolist()
             if sample_fighters:
-                logger.info(f"Sample preserved fighters: {', '.join(sample_fighters)}")
+                log.info(f"Sample preserved fighters: {', '.join(sample_fighters)}")
         else:
-            logger.info("No purged fighters found - all fighters in living data are also in latest data")
+            log.info("No purged fighters found - all fighters in living data are also in latest data")
             purged_data = pd.DataFrame()
             result_stats['preserved_records'] = 0
         
         # Check for data overlaps (fighters in both datasets)
-        overlap_count = len(living_fighters & latest_fighters)
-        logger.info(f"Found {overlap_count} fighters in both datasets")
+        overlap_count = len(np.intersect1d(living_fighter_codes, latest_fighter_codes, assume_unique=True))
+        log.info(f"Found {overlap_count} fighters in both datasets")
         
         # Combine datasets and drop duplicates
         start_time = time.time()
         
-        # Concatenate latest data with purged data (if any)
+        # Concatenate latest data with purged data (if any); with nothing to preserve,
+        # deduplicate latest_data directly (drop_duplicates returns a new frame anyway)
         if not purged_data.empty:
-            combined_data = pd.concat([latest_data, purged_data])
+            combined_data = pd.concat([latest_data, purged_data], ignore_index=True)
         else:
-            combined_data = latest_data.copy()
+            combined_data = latest_data
         
         # Get count of records before deduplication
         before_count = len(combined_data)
         
-        # Drop duplicates
-        combined_data = combined_data.drop_duplicates()
+        # Drop duplicate fighters by key rather than hashing every column;
+        # latest data comes first, so its records win
+        combined_data = combined_data.drop_duplicates(subset=list(KEY_COLS), keep='first')
         
         # Get count after deduplication
         after_count = len(combined_data)
         new_unique = max(0, after_count - len(living_data))  # Ensure non-negative
         
-        logger.info(f"Removed {before_count - after_count} duplicate entries")
+        log.info(f"Removed {before_count - after_count} duplicate entries")
         processing_time = time.time() - start_time
-        logger.info(f"Processing completed in {processing_time:.2f} seconds")
+        log.info(f"Processing completed in {processing_time:.2f} seconds")
+        
+        # A refresh that changes nothing (no purged fighters, and the result matches
+        # the living data row for row) does not need the living file rewritten
+        unchanged = (len(purged_fighters) == 0
+                     and len(combined_data) == len(living_data)
+                     and combined_data.columns.equals(living_data.columns)
+                     and np.array_equal(pd.util.hash_pandas_object(combined_data, index=False).to_numpy(),
+                                        pd.util.hash_pandas_object(living_data, index=False).to_numpy()))
         
         # Save updated dataset
-        if not dry_run:
-            combined_data.to_csv(living_file, index=False)
-            logger.info(f"Successfully updated {living_file}")
+        if unchanged:
+            log.info(f"No changes: {living_file} is already up to date")
+        elif not dry_run:
+            write_csv_atomic(combined_data, living_file)
+            log.info(f"Successfully updated {living_file}")
         else:
-            logger.info(f"DRY RUN: Would update {living_file} with {after_count} records")
+            log.info(f"DRY RUN: Would update {living_file} with {after_count} records")
         
         # Update result statistics
         result_stats['status'] = 'success'
@@ -220,22 +345,23 @@ def merge_ufc_data(living_file, latest_file, backup=True, force=False, dry_run=F
         result_stats['new_unique_records'] = new_unique
         
         # Print statistics
-        logger.info(f"\nStatistics:")
-        logger.info(f"Previous records in living dataset: {len(living_data)}")
-        logger.info(f"Records in latest dataset: {len(latest_data)}")
-        logger.info(f"Fighters preserved (purged by ESPN): {len(purged_fighters)}")
-        logger.info(f"Records preserved: {result_stats['preserved_records']}")
-        logger.info(f"New unique records added: {new_unique}")
-        logger.info(f"Total unique records: {after_count}")
+        log.info(f"\nStatistics:")
+        log.info(f"Previous records in living dataset: {len(living_data)}")
+        log.info(f"Records in latest dataset: {len(latest_data)}")
+        log.info(f"Fighters preserved (purged by ESPN): {len(purged_fighters)}")
+        log.info(f"Records preserved: {result_stats['preserved_records']}")
+        log.info(f"New unique records added: {new_unique}")
+        log.info(f"Total unique records: {after_count}")
         
         return result_stats
         
     except Exception as e:
-        logger.error(f"Error processing {file_type}: {str(e)}", exc_info=True)
+        log.error("Error processing %s: %s", file_type, e)
+        log.debug("Traceback for %s", file_type, exc_info=True)
         result_stats['error'] = str(e)
         return result_stats
 
-def process_all_files(backup=True, force=False, dry_run=False, types=None):
+def process_all_files(backup=True, force=False, dry_run=False, types=None, run_stamp=None):
     """
     Process all UFC data files in the current directory
     
@@ -244,10 +370,16 @@ def process_all_files(backup=True, force=False, dry_run=False, types=None):
     force (bool): Whether to proceed even if validation fails
     dry_run (bool): If True, performs all operations except actual file writing
     types (list): List of data types to process, defaults to all
+    run_stamp (str): Date stamp (YYYYMMDD) for backup names, defaults to today
     
     Returns:
     dict: Summary of operations
     """
+    # One clock read per run, shared by every file's backup name
+    run_time = datetime.now()
+    if run_stamp is None:
+        run_stamp = run_time.strftime("%Y%m%d")
+    
     data_types_to_process = types if types else DATA_TYPES
     logger.info(f"Processing the following data types: {', '.join(data_types_to_process)}")
     
@@ -255,16 +387,40 @@ def process_all_files(backup=True, force=False, dry_run=False, types=None):
         'success': [],
         'failed': [],
         'skipped': [],
-        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'timestamp': run_time.strftime("%Y-%m-%d %H:%M:%S"),
         'stats': {}
     }
     
-    for data_type in data_types_to_process:
-        living_file = f"{data_type}_living.csv"
-        latest_file = f"{data_type}_latest.csv"
+    # One directory scan answers every existence check below
+    present = {entry.name for entry in os.scandir('.') if entry.is_file()}
+    
+    # The data types are independent files; merge them in parallel threads,
+    # which overlap while pandas releases the GIL in parsing, hashing and I/O
+    with ThreadPoolExecutor(max_workers=len(data_types_to_process)) as executor:
+        futures = {}
+        for data_type in data_types_to_process:
+            living_file = f"{data_type}_living.csv"
+            latest_file = f"{data_type}_latest.csv"
+            
+            if latest_file in present:
+                futures[data_type] = executor.submit(merge_ufc_data, living_file, latest_file, backup, force, dry_run,
+                                                     run_stamp, present)
+            else:
+                logger.warning(f"Skipping {data_type}: Latest file not found")
+                futures[data_type] = None
         
-        if os.path.exists(latest_file):
-            result = merge_ufc_data(living_file, latest_file, backup, force, dry_run)
+        # Collect in the requested order
+        for data_type, future in futures.items():
+            if future is None:
+                results['skipped'].append(data_type)
+                results['stats'][data_type] = {
+                    'file_type': data_type,
+                    'status': 'skipped',
+                    'error': 'Latest file not found'
+                }
+                continue
+            
+            result = future.result()
             results['stats'][data_type] = result
             
             if result['status'] == 'success':
@@ -273,14 +429,6 @@ def process_all_files(backup=True, force=False, dry_run=False, types=None):
                 results['skipped'].append(data_type)
             else:
                 results['failed'].append(data_type)
-        else:
-            logger.warning(f"Skipping {data_type}: Latest file not found")
-            results['skipped'].append(data_type)
-            results['stats'][data_type] = {
-                'file_type': data_type,
-                'status': 'skipped',
-                'error': 'Latest file not found'
-            }
     
     return results
 
@@ -313,8 +461,16 @@ def print_summary(results):
     if not results['success'] and not results['failed'] and not results['skipped']:
         logger.info("\nNo data was processed. Make sure files exist in the current directory.")
 
-def main():
-    """Main function to parse arguments and run the script"""
+def main(argv=None):
+    """
+    Main function to parse arguments and run the script
+    
+    Parameters:
+    argv (list): Command line arguments, defaults to sys.argv[1:]
+    
+    Returns:
+    int: Exit code
+    """
     parser = argparse.ArgumentParser(description='UFC Data Merger - Merges latest scraped data with living database')
     parser.add_argument('--no-backup', action='store_true', help='Skip creating backups before merging')
     parser.add_argument('--force', action='store_true', help='Force merge even if validation fails')
@@ -322,11 +478,12 @@ def main():
     parser.add_argument('--types', nargs='+', choices=DATA_TYPES, help='Specific data types to process')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose logging')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Set up logging level based on arguments
     global logger
-    logger = setup_logging(logging.DEBUG if args.verbose else logging.INFO)
+    run_stamp = datetime.now().strftime("%Y%m%d")
+    logger = setup_logging(logging.DEBUG if args.verbose else logging.INFO, run_stamp)
     
     logger.info("UFC Data Merger - Starting Process")
     logger.info("="*50)
@@ -339,7 +496,8 @@ def main():
         backup=not args.no_backup,
         force=args.force,
         dry_run=args.dry_run,
-        types=args.types
+        types=args.types,
+        run_stamp=run_stamp
     )
     
     # Print summary
@@ -14,47 +14,61 @@ import os
 import sys
 import shutil
 import argparse
-import subprocess
 from datetime import datetime
 
 # UFC data file types
 DATA_TYPES = ['ground_data', 'clinch_data', 'striking_data']
 
+def link_file(src, dst):
+    """Make dst a hardlink to src, replacing dst, or a copy where links are not supported"""
+    try:
+        os.remove(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
 def prepare_files():
     """Prepare files by renaming freshly scraped files to the *_latest.csv format if needed"""
     renamed = []
     
+    # One directory scan instead of an exists check per data type
+    present = {entry.name for entry in os.scandir('.') if entry.is_file()}
+    
     for data_type in DATA_TYPES:
         # Check if raw scraped file exists (without _latest suffix)
         raw_file = f"{data_type}.csv"
         latest_file = f"{data_type}_latest.csv"
         
-        if os.path.exists(raw_file):
-            # Make a copy as the latest file
-            print(f"Found freshly scraped {raw_file}, copying to {latest_file}")
-            shutil.copy(raw_file, latest_file)
+        if raw_file in present:
+            # Expose it as the latest file; the merger only reads it, so a link will do
+            print(f"Found freshly scraped {raw_file}, linking to {latest_file}")
+            link_file(raw_file, latest_file)
             renamed.append(data_type)
     
     return renamed
 
 def run_merger(force=False, verbose=False, types=None, no_backup=False, dry_run=False):
-    """Run the merger script with the specified options"""
-    cmd = ["python", "postscrapemerge.py"]
+    """Run the merger in-process with the specified options"""
+    import postscrapemerge
     
+    argv = []
     if force:
-        cmd.append("--force")
+        argv.append("--force")
     if verbose:
-        cmd.append("--verbose")
+        argv.append("--verbose")
     if no_backup:
-        cmd.append("--no-backup")
+        argv.append("--no-backup")
     if dry_run:
-        cmd.append("--dry-run")
+        argv.append("--dry-run")
     if types:
-        cmd.append("--types")
-        cmd.extend(types)
+        argv.append("--types")
+        argv.extend(types)
     
-    print(f"Running merger: {' '.join(cmd)}")
-    subprocess.run(cmd)
+    print(f"Running merger: {' '.join(['postscrapemerge.py'] + argv)}")
+    return postscrapemerge.main(argv)
 
 def main():
     """Main function to parse arguments and run the script"""
@@ -1,20 +1,34 @@
 #!/usr/bin/env python3
 
-import requests
+import asyncio
+import httpx
 import pandas as pd
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-from tqdm import tqdm
+from tqdm.asyncio import tqdm
+from urllib.parse import quote
 import os
-from bs4 import BeautifulSoup
+import csv
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import time
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 import random
-from datetime import datetime
+
+from fighter_profiles_processor import (
+    SECTION_OUTPUT_FILES, list_html_files, log_section_counts, open_section_writers, parse_profile_page
+)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# httpx logs every request at INFO; keep scrape logs to our own messages
+logging.getLogger('httpx').setLevel(logging.WARNING)
 
 class ESPNFighterScraper:
     USER_AGENTS = [
@@ -25,6 +39,12 @@ class ESPNFighterScraper:
         'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     ]
 
+    REQUESTS_PER_MINUTE = 25
+    RETRY_STATUSES = frozenset({403, 429, 500, 502, 503, 504})
+    # Saved pages younger than this are reused instead of downloaded again
+    CACHE_TTL = 7 * 86400
+    URL_MAPPING_FILE = 'url_mapping.json'
+
     def __init__(self, output_dir: str = 'fighter_profiles', max_workers: int = 3, 
                  rate_limit: float = 2.0, max_retries: int = 5):
         self.output_dir = Path(output_dir)
@@ -32,124 +52,166 @@ class ESPNFighterScraper:
         self.max_workers = max_workers
         self.rate_limit = rate_limit
         self.max_retries = max_retries
-        self.session = self._create_session()
+        # fighter name -> ESPN profile/stats URLs from earlier searches
+        self.url_mapping_path = self.output_dir / self.URL_MAPPING_FILE
+        self.url_mapping = self._load_url_mapping()
+        # Created inside the event loop by scrape_fighters
+        self._client: Optional[httpx.AsyncClient] = None
+        self._rate_lock: Optional[asyncio.Lock] = None
         
         self.success_count = 0
         self.failure_count = 0
-        self.last_request_time = 0
         self.request_count = 0
-        self.requests_this_minute = 0
-        self.minute_start = datetime.now()
+        # rate_limit is the minimum average spacing between requests
+        self._refill_rate = self.REQUESTS_PER_MINUTE / 60
+        if rate_limit > 0:
+            self._refill_rate = min(self._refill_rate, 1 / rate_limit)
+        self._tokens = float(self.REQUESTS_PER_MINUTE)
+        self._last_refill = time.monotonic()
 
-    def _create_session(self) -> requests.Session:
-        session = requests.Session()
-        
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=2,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"]
+    def _create_client(self) -> httpx.AsyncClient:
+        # One pooled HTTP/2 client for all fighters: every in-flight fetch to an
+        # ESPN host is multiplexed over a single TLS connection, which stays
+        # open across the pauses between chunks
+        return httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60),
+            timeout=15,
+            follow_redirects=True,
+            headers={
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.5',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'DNT': '1',
+                'Upgrade-Insecure-Requests': '1'
+            }
         )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("https://", adapter)
-        session.mount("http://", adapter)
-        
-        session.headers.update({
-            'User-Agent': random.choice(self.USER_AGENTS),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
-        
-        return session
 
-    def _rotate_user_agent(self):
-        self.session.headers['User-Agent'] = random.choice(self.USER_AGENTS)
+    async def _rate_limit_wait(self):
+        # Token bucket: bursts of up to REQUESTS_PER_MINUTE, refilled continuously
+        # so the long-run rate never exceeds the upstream budget
+        async with self._rate_lock:
+            now = time.monotonic()
+            self._tokens = min(float(self.REQUESTS_PER_MINUTE),
+                               self._tokens + (now - self._last_refill) * self._refill_rate)
+            self._last_refill = now
+            
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._refill_rate + random.uniform(0, 0.25))
+                self._tokens = 0.0
+                self._last_refill = time.monotonic()
+            else:
+                self._tokens -= 1
+
+    async def _make_request(self, url: str, follow_redirects: bool = True) -> str:
+        """GET url and return the response body, retrying on 403, 429, 5xx and connection errors."""
+        for attempt in range(self.max_retries + 1):
+            await self._rate_limit_wait()
+            
+            headers = {'User-Agent': random.choice(self.USER_AGENTS)}
+            try:
+                response = await self._client.get(url, headers=headers, follow_redirects=follow_redirects)
+                response.raise_for_status()
+                return response.text
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if status not in self.RETRY_STATUSES or attempt == self.max_retries:
+                    raise
+                error = f"{status} error"
+            except httpx.TransportError as e:
+                # Timeouts, resets and HTTP/2 GOAWAYs are as transient as a 503
+                if attempt == self.max_retries:
+                    raise
+                error = f"{type(e).__name__}"
+            # Jittered so concurrent fetches that failed together retry apart
+            wait_time = min(60, 2 ** attempt) * random.uniform(0.5, 1.5)
+            logging.warning(f"{error}, waiting {wait_time:.2f} seconds before retry {attempt + 1}")
+            await asyncio.sleep(wait_time)
 
-    def _rate_limit_wait(self):
-        current_time = datetime.now()
+    async def _search_fighter(self, fighter_name: str) -> Tuple[Optional[str], Optional[str]]:
+        """Look up a fighter on ESPN search and return (profile_url, stats_url)."""
+        encoded_name = quote(fighter_name)
+        search_url = f"https://site.web.api.espn.com/apis/search/v2?region=us&lang=en&limit=10&page=1&query={encoded_name}"
         
-        if (current_time - self.minute_start).total_seconds() >= 60:
-            self.requests_this_minute = 0
-            self.minute_start = current_time
+        search_body = await self._make_request(search_url, follow_redirects=False)
+        data_json = orjson.loads(search_body) if ORJSON_AVAILABLE else json.loads(search_body)
         
-        if self.requests_this_minute >= 25:
-            sleep_time = 60 - (current_time - self.minute_start).total_seconds()
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-                self.minute_start = datetime.now()
-                self.requests_this_minute = 0
+        # Find player data
+        player_json_data = None
+        if "results" in data_json:
+            for result in data_json["results"]:
+                if result.get("type") == "player":
+                    contents = result.get("contents", [])
+                    if isinstance(contents, list):
+                        for content in contents:
+                            if content.get("sport") == "mma":
+                                player_json_data = content
+                                break
+                if player_json_data:
+                    break
         
-        time_since_last = time.time() - self.last_request_time
-        if time_since_last < self.rate_limit:
-            time.sleep(self.rate_limit - time_since_last)
+        if not player_json_data:
+            logging.warning(f"No MMA fighter found for {fighter_name}")
+            return None, None
         
-        self.last_request_time = time.time()
-        self.requests_this_minute += 1
+        profile_url = player_json_data["link"]["web"]
+        return profile_url, profile_url.replace("/_/id/", "/stats/_/id/")
 
-    def _make_request(self, url: str, retries: int = 0) -> requests.Response:
+    def _load_url_mapping(self) -> Dict[str, Dict[str, str]]:
         try:
-            self._rate_limit_wait()
-            self._rotate_user_agent()
-            
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 403 and retries < self.max_retries:
-                wait_time = (2 ** retries) + random.uniform(0, 1)
-                logging.warning(f"403 error, waiting {wait_time:.2f} seconds before retry {retries + 1}")
-                time.sleep(wait_time)
-                return self._make_request(url, retries + 1)
-            raise
+            with open(self.url_mapping_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_url_mapping(self) -> None:
+        tmp_path = self.url_mapping_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.url_mapping, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.url_mapping_path)
 
-    def fetch_fighter_data(self, fighter_name: str) -> Optional[Dict]:
+    async def fetch_fighter_data(self, fighter_name: str) -> Optional[Dict]:
         try:
-            # Step 1: Search for fighter
-            encoded_name = requests.utils.quote(fighter_name)
-            search_url = f"https://site.web.api.espn.com/apis/search/v2?region=us&lang=en&limit=10&page=1&query={encoded_name}"
-            
-            search_response = self._make_request(search_url)
-            data_json = search_response.json()
+            file_path = self.output_dir / f"{fighter_name.replace(' ', '_')}.html"
+            cached = self.url_mapping.get(fighter_name)
             
-            # Find player data
-            player_json_data = None
-            if "results" in data_json:
-                for result in data_json["results"]:
-                    if result.get("type") == "player":
-                        contents = result.get("contents", [])
-                        if isinstance(contents, list):
-                            for content in contents:
-                                if content.get("sport") == "mma":
-                                    player_json_data = content
-                                    break
-                    if player_json_data:
-                        break
+            # One stat serves both the freshness check and the overwrite log below
+            try:
+                html_mtime = file_path.stat().st_mtime
+            except FileNotFoundError:
+                html_mtime = None
             
-            if not player_json_data:
-                logging.warning(f"No MMA fighter found for {fighter_name}")
-                self.failure_count += 1
-                return None
+            if cached:
+                # Search result known from an earlier run; skip the search call and,
+                # when the saved page is still fresh, the stats download too
+                profile_url = cached['profile_url']
+                stats_url = cached['stats_url']
+                if html_mtime is not None and time.time() - html_mtime < self.CACHE_TTL:
+                    self.success_count += 1
+                    logging.info(f"Using cached ESPN HTML for {fighter_name}")
+                    return {
+                        'name': fighter_name,
+                        'profile_url': profile_url,
+                        'stats_url': stats_url,
+                        'file_path': str(file_path)
+                    }
+            else:
+                profile_url, stats_url = await self._search_fighter(fighter_name)
+                if profile_url is None:
+                    self.failure_count += 1
+                    return None
+                self.url_mapping[fighter_name] = {'profile_url': profile_url, 'stats_url': stats_url}
             
             # Step 2: Get fighter stats page
-            profile_url = player_json_data["link"]["web"]
-            stats_url = profile_url.replace("/_/id/", "/stats/_/id/")
-            
-            profile_response = self._make_request(stats_url)
+            profile_html = await self._make_request(stats_url)
             
             # Save HTML content (upsert mode - overwrites existing files)
-            file_path = self.output_dir / f"{fighter_name.replace(' ', '_')}.html"
-            if file_path.exists():
+            if html_mtime is not None:
                 logging.info(f"Overwriting existing ESPN HTML for {fighter_name}")
             else:
                 logging.info(f"Creating new ESPN HTML for {fighter_name}")
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(profile_response.text)
+            # Write off the event loop so other fetches keep going
+            await asyncio.to_thread(file_path.write_text, profile_html, encoding='utf-8')
             
             self.success_count += 1
             logging.info(f"Successfully processed {fighter_name}")
@@ -166,90 +228,79 @@ class ESPNFighterScraper:
             logging.error(f"Error processing {fighter_name}: {str(e)}")
             return None
 
-    def process_saved_profiles(self) -> Dict[str, pd.DataFrame]:
-        section_data = {
-            'striking': [],
-            'Clinch': [],
-            'Ground': []
-        }
-        
-        columns = {
-            'striking': ['Date', 'Opponent', 'Event', 'Result', 'SDBL/A', 'SDHL/A', 'SDLL/A', 
-                        'TSL', 'TSA', 'SSL', 'SSA', 'TSL-TSA', 'KD', '%BODY', '%HEAD', '%LEG'],
-            'Clinch': ['Date', 'Opponent', 'Event', 'Result', 'SCBL', 'SCBA', 'SCHL', 'SCHA',
-                      'SCLL', 'SCLA', 'RV', 'SR', 'TDL', 'TDA', 'TDS', 'TK ACC'],
-            'Ground': ['Date', 'Opponent', 'Event', 'Result', 'SGBL', 'SGBA', 'SGHL', 'SGHA',
-                      'SGLL', 'SGLA', 'AD', 'ADHG', 'ADTB', 'ADTM', 'ADTS', 'SM']
-        }
+    def process_saved_profiles(self) -> Dict[str, str]:
+        """Write striking/Clinch/Ground rows from the saved pages straight to CSV.
 
-        for file_path in self.output_dir.glob('*.html'):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    soup = BeautifulSoup(f.read(), 'lxml')
-                
-                player_name_elem = soup.find('h1', class_='PlayerHeader__Name')
-                player_name = player_name_elem.get_text(strip=True) if player_name_elem else 'Unknown Player'
-                
-                for section in ['striking', 'Clinch', 'Ground']:
-                    title_div = soup.find('div', string=section)
-                    if title_div:
-                        table = title_div.find_next('table')
-                        if table:
-                            rows = table.find_all('tr')[1:]  # Skip header
-                            for row in rows:
-                                cols = [td.get_text(strip=True) for td in row.find_all('td')]
-                                if len(cols) >= len(columns[section]):
-                                    data = {'Player': player_name}
-                                    data.update(dict(zip(columns[section], cols)))
-                                    section_data[section].append(data)
+        Returns the output path for each section.
+        """
+        html_files = list_html_files(self.output_dir)
+        
+        with ExitStack() as stack:
+            writers = open_section_writers(stack)
+            row_counts = dict.fromkeys(writers, 0)
             
-            except Exception as e:
-                logging.error(f"Error processing file {file_path}: {str(e)}")
+            # Parsing is CPU-bound and independent per file, so spread it over all cores
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=os.cpu_count()))
+            pages = executor.map(partial(parse_profile_page, profile=False, sections=True),
+                                 html_files, chunksize=8)
+            for _, section_rows in tqdm(pages, total=len(html_files), desc="Processing saved profiles"):
+                for section, rows in section_rows.items():
+                    writers[section].writerows(rows)
+                    row_counts[section] += len(rows)
 
-        # Convert to DataFrames if there's data
-        result_dfs = {}
-        for section, data in section_data.items():
-            if data:  # Only create DataFrame if there's data
-                result_dfs[section] = pd.DataFrame(data)
-            else:
-                logging.warning(f"No data found for section: {section}")
-                result_dfs[section] = pd.DataFrame(columns=['Player'] + columns[section])
-                
-        return result_dfs
+        log_section_counts(row_counts)
+        return dict(SECTION_OUTPUT_FILES)
 
-    def scrape_fighters(self, fighters: List[str]) -> Dict[str, pd.DataFrame]:
-        logging.info(f"Starting scrape for {len(fighters)} fighters")
-        
+    async def _scrape_async(self, fighters: List[str]) -> List[Optional[Dict]]:
         chunk_size = 50
         all_results = []
         
-        for i in range(0, len(fighters), chunk_size):
-            chunk = fighters[i:i + chunk_size]
-            
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                chunk_results = list(tqdm(
-                    executor.map(self.fetch_fighter_data, chunk),
-                    total=len(chunk),
-                    desc=f"Processing fighters {i+1}-{min(i+chunk_size, len(fighters))}"
-                ))
-                all_results.extend(chunk_results)
-            
-            if i + chunk_size < len(fighters):
-                pause_time = random.uniform(5, 10)
-                logging.info(f"Pausing for {pause_time:.2f} seconds between chunks")
-                time.sleep(pause_time)
+        self._rate_lock = asyncio.Lock()
+        semaphore = asyncio.Semaphore(self.max_workers * 4)
+        
+        async def fetch_limited(fighter_name: str) -> Optional[Dict]:
+            async with semaphore:
+                return await self.fetch_fighter_data(fighter_name)
+        
+        try:
+            async with self._create_client() as self._client:
+                for i in range(0, len(fighters), chunk_size):
+                    chunk = fighters[i:i + chunk_size]
+                    
+                    chunk_results = await tqdm.gather(
+                        *(fetch_limited(name) for name in chunk),
+                        total=len(chunk),
+                        desc=f"Processing fighters {i+1}-{min(i+chunk_size, len(fighters))}"
+                    )
+                    all_results.extend(chunk_results)
+                    # Flush per chunk so a killed run keeps the searches it already paid for
+                    self._save_url_mapping()
+                    
+                    if i + chunk_size < len(fighters):
+                        pause_time = random.uniform(5, 10)
+                        logging.info(f"Pausing for {pause_time:.2f} seconds between chunks")
+                        await asyncio.sleep(pause_time)
+        finally:
+            self._client = None
+            # Also covers an interrupt or error partway through a chunk
+            self._save_url_mapping()
+        return all_results
+
+    def scrape_fighters(self, fighters: List[str]) -> Dict[str, pd.DataFrame]:
+        logging.info(f"Starting scrape for {len(fighters)} fighters")
+        
+        all_results = asyncio.run(self._scrape_async(fighters))
         
         successful_fighters = [r for r in all_results if r is not None]
         logging.info(f"Successfully processed {len(successful_fighters)} out of {len(fighters)} fighters")
         
-        section_dfs = self.process_saved_profiles()
+        output_paths = self.process_saved_profiles()
         
-        for section, df in section_dfs.items():
-            output_path = f'{section.lower()}_data.csv'
-            df.to_csv(output_path, index=False)
-            logging.info(f"Saved {section} data to {output_path}")
-        
-        return section_dfs
+        # Callers work with DataFrames, so load the written sections back as text
+        return {
+            section: pd.read_csv(output_path, dtype=str, keep_default_na=False)
+            for section, output_path in output_paths.items()
+        }
 
 
 def main():
@@ -266,8 +317,9 @@ def main():
     fighters_csv_path = script_dir / 'fighters_name.csv'
     
     try:
-        fighters_df = pd.read_csv(fighters_csv_path)
-        fighters = fighters_df["Fighter Name"].tolist()
+        # A single column of names needs no DataFrame
+        with open(fighters_csv_path, newline='', encoding='utf-8-sig') as f:
+            fighters = [row["Fighter Name"] for row in csv.DictReader(f) if row["Fighter Name"]]
 
         # Optional sampling controls via env vars
         try:
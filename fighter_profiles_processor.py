@@ -5,30 +5,129 @@ Dedicated script for processing HTML files and extracting comprehensive fighter
 Creates fighter_profiles.csv with all extracted information.
 """
 
+import os
+import csv
 import pandas as pd
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
 from tqdm import tqdm
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import re
-from bs4 import BeautifulSoup
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('fighter_profiles_processor.log'),
-        logging.StreamHandler()
-    ]
+import lxml.html
+from lxml import etree
+
+def _class_predicate(css_class: str) -> str:
+    if ' ' in css_class:
+        return f"normalize-space(@class)='{css_class}'"
+    # The raw substring test is cheap and rejects most elements before the token comparison runs
+    return f"contains(@class, '{css_class}') and contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')"
+
+def _class_xpath(path: str, tag: str, css_class: str) -> etree.XPath:
+    """Compile an XPath matching `tag` elements that carry the `css_class` token."""
+    return etree.XPath(f"{path}{tag}[{_class_predicate(css_class)}]")
+
+def _class_buckets(element: lxml.html.HtmlElement, xpath: etree.XPath, classes: tuple) -> Dict[str, List]:
+    """Run one multi-class XPath and group the matches by which of `classes` they carry."""
+    buckets = {css_class: [] for css_class in classes}
+    for match in xpath(element):
+        for token in match.get('class', '').split():
+            if token in buckets:
+                buckets[token].append(match)
+    return buckets
+
+def _first(elements: List) -> Optional[lxml.html.HtmlElement]:
+    return elements[0] if elements else None
+
+def _stripped_text(element: lxml.html.HtmlElement) -> str:
+    """Text of every descendant, each piece stripped, joined without separators."""
+    return ''.join(text.strip() for text in element.itertext())
+
+HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+# Title texts are joined on this separator and swept by one regex; each match is the label
+# before a title's first percentage, and the rest of that title is consumed
+TITLE_SEPARATOR = '\x1f'
+PERCENT_RE = re.compile(r'([^\x1f]*?)(\d+%)[^\x1f]*')
+RESULT_LABELS = ('Round', 'Time', 'Method')
+
+# Compiled once, evaluated by libxml2 for every profile page
+XP_HERO_INFO = _class_xpath('//', '*', 'hero-profile__info')
+XP_HERO_NAME = _class_xpath('.//', '*', 'hero-profile__name')
+XP_HERO_DIVISION_TITLE = _class_xpath('.//', '*', 'hero-profile__division-title')
+XP_HERO_DIVISION_BODY = _class_xpath('.//', '*', 'hero-profile__division-body')
+XP_HERO_STATS = _class_xpath('.//', '*', 'hero-profile__stat')
+XP_HERO_STAT_TEXT = _class_xpath('.//', '*', 'hero-profile__stat-text')
+XP_HERO_STAT_NUMB = _class_xpath('.//', '*', 'hero-profile__stat-numb')
+# Only titles that can hold a percentage are handed back to Python
+XP_TITLES = etree.XPath("//title[contains(., '%')]")
+XP_CAROUSEL = _class_xpath('//', 'div', 'c-carousel--multiple__content carousel__multiple-items stats-records-inner-wrap')
+# The carousel's three stat blocks are collected in a single walk of its subtree
+CAROUSEL_SECTION_CLASSES = ('c-overlap__stats', 'c-stat-compare__group', 'c-stat-3bar')
+XP_CAROUSEL_SECTIONS = etree.XPath(
+    './/*[' + ' or '.join(_class_predicate(c) for c in CAROUSEL_SECTION_CLASSES) + ']'
+)
+XP_OVERLAP_STATS_TEXT = _class_xpath('.//', '*', 'c-overlap__stats-text')
+XP_OVERLAP_STATS_VALUE = _class_xpath('.//', '*', 'c-overlap__stats-value')
+XP_COMPARE_NUMBER = _class_xpath('.//', '*', 'c-stat-compare__number')
+XP_COMPARE_LABEL = _class_xpath('.//', '*', 'c-stat-compare__label')
+XP_COMPARE_PERCENT = _class_xpath('.//', '*', 'c-stat-compare__percent')
+XP_COMPARE_SUFFIX = _class_xpath('.//', '*', 'c-stat-compare__label-suffix')
+XP_3BAR_TITLE = _class_xpath('.//', 'h2', 'c-stat-3bar__title')
+XP_3BAR_GROUPS = _class_xpath('.//', 'div', 'c-stat-3bar__group')
+XP_3BAR_LABEL = _class_xpath('.//', 'div', 'c-stat-3bar__label')
+XP_3BAR_VALUE = _class_xpath('.//', 'div', 'c-stat-3bar__value')
+XP_STRIKE_TITLE = _class_xpath('//', 'div', 'c-stat-body__title')
+XP_STRIKE_TARGET = _class_xpath('.//', '*', 'e-t5')
+XP_HEAD_TXT = etree.XPath("//*[@id='e-stat-body_x5F__x5F_head-txt']")
+XP_BODY_TXT = etree.XPath("//*[@id='e-stat-body_x5F__x5F_body-txt']")
+XP_LEG_TXT = etree.XPath("//*[@id='e-stat-body_x5F__x5F_leg-txt']")
+XP_SVG_TEXT = etree.XPath('.//text')
+XP_EVENTS = _class_xpath('//', 'li', 'l-listing__item')
+EVENT_DATE_CLASS = 'c-card-event--athlete-results__date'
+EVENT_RESULTS_CLASS = 'c-card-event--athlete-results__results'
+# Headline, date, result sections and the result texts inside them, from one walk of the event in document order
+XP_EVENT_PARTS = etree.XPath(' | '.join((
+    _class_xpath('.//', 'h3', 'c-card-event--athlete-results__headline').path,
+    _class_xpath('.//', 'div', EVENT_DATE_CLASS).path,
+    _class_xpath('.//', 'div', EVENT_RESULTS_CLASS).path,
+    _class_xpath('.//', 'div', EVENT_RESULTS_CLASS).path
+    + _class_xpath('//', 'div', 'c-card-event--athlete-results__result-text').path,
+)))
+XP_LINKS = etree.XPath('.//a')
+XP_BIO_FIELDS = _class_xpath('//', 'div', 'c-bio__field')
+XP_BIO_LABEL = _class_xpath('.//', 'div', 'c-bio__label')
+XP_BIO_TEXT = _class_xpath('.//', 'div', 'c-bio__text')
+
+# ESPN stats tables: section title -> columns, written to <section>_data.csv
+SECTION_COLUMNS = {
+    'striking': ['Date', 'Opponent', 'Event', 'Result', 'SDBL/A', 'SDHL/A', 'SDLL/A', 
+                'TSL', 'TSA', 'SSL', 'SSA', 'TSL-TSA', 'KD', '%BODY', '%HEAD', '%LEG'],
+    'Clinch': ['Date', 'Opponent', 'Event', 'Result', 'SCBL', 'SCBA', 'SCHL', 'SCHA',
+              'SCLL', 'SCLA', 'RV', 'SR', 'TDL', 'TDA', 'TDS', 'TK ACC'],
+    'Ground': ['Date', 'Opponent', 'Event', 'Result', 'SGBL', 'SGBA', 'SGHL', 'SGHA',
+              'SGLL', 'SGLA', 'AD', 'ADHG', 'ADTB', 'ADTM', 'ADTS', 'SM']
+}
+SECTION_OUTPUT_FILES = {section: f'{section.lower()}_data.csv' for section in SECTION_COLUMNS}
+
+XP_PLAYER_NAME = _class_xpath('//', 'h1', 'PlayerHeader__Name')
+XP_SECTION_TITLES = etree.XPath(
+    '//div[' + ' or '.join(f"string()='{section}'" for section in SECTION_COLUMNS) + ']'
 )
+XP_NEXT_TABLE = etree.XPath('(descendant::table | following::table)[1]')
+XP_ROWS = etree.XPath('.//tr')
+XP_CELLS = etree.XPath('.//td')
 
 class FighterProfilesProcessor:
     """Process HTML files to extract comprehensive fighter profile data."""
     
-    def __init__(self, html_dir: str = 'fighter_profiles'):
+    def __init__(self, html_dir: str = 'fighter_profiles', write_sections: bool = True):
         self.html_dir = Path(html_dir)
+        # Also write the ESPN striking/Clinch/Ground tables from the same parse
+        self.write_sections = write_sections
         self.fighter_profiles = []
         self.success_count = 0
         self.failure_count = 0
@@ -41,22 +140,20 @@ class FighterProfilesProcessor:
         
         logging.info(f"Processing HTML files from {self.html_dir}")
         
-        html_files = list(self.html_dir.glob('*.html'))
+        html_files = list_html_files(self.html_dir)
         logging.info(f"Found {len(html_files)} HTML files to process")
         
-        for html_file in tqdm(html_files, desc="Processing HTML files"):
-            try:
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-                
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                # Extract fighter name from filename
-                fighter_name = html_file.stem.replace('_', ' ')
-                
-                # Extract comprehensive fighter data
-                fighter_data = self._extract_fighter_data_from_html(soup, fighter_name)
-                
+        with ExitStack() as stack:
+            writers = open_section_writers(stack) if self.write_sections else {}
+            row_counts = dict.fromkeys(writers, 0)
+            
+            # Each page is parsed once, on all cores, for both the profile and the tables
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=os.cpu_count()))
+            results = executor.map(partial(parse_profile_page, sections=self.write_sections),
+                                   html_files, chunksize=8)
+            for html_file, (fighter_data, section_rows) in tqdm(zip(html_files, results), total=len(html_files),
+                                                                desc="Processing HTML files"):
+                fighter_name = Path(html_file).stem.replace('_', ' ')
                 if fighter_data:
                     self.fighter_profiles.append(fighter_data)
                     self.success_count += 1
@@ -64,194 +161,22 @@ class FighterProfilesProcessor:
                 else:
                     self.failure_count += 1
                     logging.warning(f"Failed to extract data from {fighter_name}")
-                    
-            except Exception as e:
-                self.failure_count += 1
-                logging.error(f"Error processing {html_file}: {e}")
+                
+                for section, rows in section_rows.items():
+                    writers[section].writerows(rows)
+                    row_counts[section] += len(rows)
+        
+        log_section_counts(row_counts)
 
-    def _extract_fighter_data_from_html(self, soup: BeautifulSoup, fighter_name: str) -> Optional[Dict]:
+    @staticmethod
+    def _extract_fighter_data_from_html(tree: lxml.html.HtmlElement, fighter_name: str) -> Optional[Dict]:
         """Extract comprehensive fighter data from HTML content using A1 techniques."""
         fighter_data = {
             'Name': fighter_name,
             'Source': 'HTML File',
             'Processing_Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
-        
-        # Extract hero profile info
-        hero_info_div = soup.find(class_='hero-profile__info')
-        if hero_info_div:
-            # Basic info
-            try:
-                name_elem = hero_info_div.find(class_='hero-profile__name')
-                if name_elem:
-                    fighter_data['Name'] = name_elem.text.strip()
-            except AttributeError:
-                pass
-            
-            # Division info
-            try:
-                division_elem = hero_info_div.find(class_='hero-profile__division-title')
-                if division_elem:
-                    fighter_data['Division_Title'] = division_elem.text.strip()
-            except AttributeError:
-                pass
-            
-            # Record info
-            try:
-                record_elem = hero_info_div.find(class_='hero-profile__division-body')
-                if record_elem:
-                    fighter_data['Division_Record'] = record_elem.text.strip()
-            except AttributeError:
-                pass
-            
-            # Extract basic stats from hero section
-            stats = {}
-            for stat in hero_info_div.find_all(class_='hero-profile__stat'):
-                try:
-                    stat_text = stat.find(class_='hero-profile__stat-text')
-                    stat_numb = stat.find(class_='hero-profile__stat-numb')
-                    if stat_text and stat_numb:
-                        stats[stat_text.text.strip()] = stat_numb.text.strip()
-                except AttributeError:
-                    pass
-            fighter_data.update(stats)
-        
-        # Extract percentages from title tags
-        percentages = {}
-        titles = soup.find_all('title')
-        pattern = re.compile(r'\d+%')
-        for title in titles:
-            try:
-                text = title.text.strip()
-                match = pattern.search(text)
-                if match:
-                    key = text.split(match.group())[0].strip()
-                    percentages[key] = match.group()
-            except:
-                pass
-        fighter_data.update(percentages)
-        
-        # Extract carousel data (comprehensive stats)
-        carousel_div = soup.find("div", class_="c-carousel--multiple__content carousel__multiple-items stats-records-inner-wrap")
-        if carousel_div:
-            # Basic carousel stats
-            carousel_stats = {}
-            stats_class = carousel_div.find_all(class_="c-overlap__stats")
-            for stat in stats_class:
-                try:
-                    label = stat.find(class_="c-overlap__stats-text").text.strip()
-                    value = stat.find(class_="c-overlap__stats-value").text.strip()
-                    carousel_stats[label] = value
-                except AttributeError:
-                    pass
-            fighter_data.update(carousel_stats)
-            
-            # Comparison stats
-            compare_stats = {}
-            stats_class = carousel_div.find_all(class_="c-stat-compare__group")
-            for stat in stats_class:
-                try:
-                    number_element = stat.find(class_='c-stat-compare__number')
-                    label_element = stat.find(class_='c-stat-compare__label')
-                    percent_element = stat.find(class_='c-stat-compare__percent')
-                    suffix_element = stat.find(class_='c-stat-compare__label-suffix')
-
-                    if number_element and label_element:
-                        number = number_element.get_text(strip=True)
-                        label = label_element.get_text(strip=True)
-
-                        if percent_element and '%' not in number:
-                            percent = percent_element.get_text(strip=True)
-                            number += ' ' + percent
-
-                        if suffix_element:
-                            suffix = suffix_element.get_text(strip=True)
-                            label += ' ' + suffix
-
-                        compare_stats[label] = number
-                except AttributeError:
-                    pass
-            fighter_data.update(compare_stats)
-            
-            # 3-bar stats
-            flat_bar_stats = {}
-            c_stat_3bar = carousel_div.find_all(class_="c-stat-3bar")
-            for element in c_stat_3bar:
-                try:
-                    title = element.find("h2", class_="c-stat-3bar__title").text.strip()
-                    groups = element.find_all("div", class_="c-stat-3bar__group")
-                    for group in groups:
-                        label = group.find("div", class_="c-stat-3bar__label").text.strip()
-                        value = group.find("div", class_="c-stat-3bar__value").text.strip()
-                        flat_key = f'{title} - {label}'
-                        flat_bar_stats[flat_key] = value
-                except AttributeError:
-                    pass
-            fighter_data.update(flat_bar_stats)
-            
-            # Strike target data
-            sig_strike_stats = {}
-            title = soup.find("div", class_="c-stat-body__title")
-            if title:
-                try:
-                    sig_str_target = title.find(class_="e-t5").text.strip()
-                    head_stats = soup.find(id="e-stat-body_x5F__x5F_head-txt").find_all("text")
-                    body_stats = soup.find(id="e-stat-body_x5F__x5F_body-txt").find_all("text")
-                    leg_stats = soup.find(id="e-stat-body_x5F__x5F_leg-txt").find_all("text")
-
-                    sig_strike_stats[f'{sig_str_target} - Head Strike Percentage'] = head_stats[0].text.strip()
-                    sig_strike_stats[f'{sig_str_target} - Head Strike Count'] = head_stats[1].text.strip()
-                    sig_strike_stats[f'{sig_str_target} - Body Strike Percentage'] = body_stats[0].text.strip()
-                    sig_strike_stats[f'{sig_str_target} - Body Strike Count'] = body_stats[1].text.strip()
-                    sig_strike_stats[f'{sig_str_target} - Leg Strike Percentage'] = leg_stats[0].text.strip()
-                    sig_strike_stats[f'{sig_str_target} - Leg Strike Count'] = leg_stats[1].text.strip()
-                except AttributeError:
-                    pass
-            fighter_data.update(sig_strike_stats)
-            
-            # Fight history/events
-            events = soup.find_all('li', class_='l-listing__item')
-            fight_details = {}
-            event_count = 0
-
-            for event in events:
-                try:
-                    headline_tag = event.find('h3', class_='c-card-event--athlete-results__headline')
-                    date_tag = event.find('div', class_='c-card-event--athlete-results__date')
-                    results_sections = event.find_all('div', class_='c-card-event--athlete-results__results')
-
-                    headline = ' vs '.join([op.text.strip() for op in headline_tag.find_all('a')]) if headline_tag else 'Headline not found'
-                    date = date_tag.text.strip() if date_tag else 'Date not found'
-
-                    if headline != 'Headline not found' and date != 'Date not found':
-                        event_count += 1
-                        event_prefix = f'Event_{event_count}_'
-                        fight_details[event_prefix + 'Headline'] = headline
-                        fight_details[event_prefix + 'Date'] = date
-
-                        for index, section in enumerate(results_sections):
-                            result_texts = section.find_all('div', class_='c-card-event--athlete-results__result-text')
-                            labels = ['Round', 'Time', 'Method']
-                            for j, result_text in enumerate(result_texts):
-                                if j < len(labels):
-                                    fight_details[event_prefix + labels[j]] = result_text.text.strip()
-                except AttributeError:
-                    pass
-            fighter_data.update(fight_details)
-        
-        # Bio data extraction
-        fields = soup.find_all("div", class_="c-bio__field")
-        bio_data = {}
-        for field in fields:
-            try:
-                label = field.find("div", class_="c-bio__label").get_text(strip=True)
-                text = field.find("div", class_="c-bio__text").get_text(strip=True)
-                bio_data[label.replace(' ', '_')] = text
-            except AttributeError:
-                pass
-        fighter_data.update(bio_data)
-        
-        return fighter_data
+        return extract_fighter_data(tree, fighter_data)
 
     def save_fighter_profiles(self, output_file: str = 'fighter_profiles.csv') -> None:
         """Save fighter profiles to CSV."""
@@ -281,8 +206,249 @@ class FighterProfilesProcessor:
         logging.info(f"Success: {self.success_count}, Failures: {self.failure_count}")
         logging.info(f"Total fighters processed: {len(self.fighter_profiles)}")
 
+def list_html_files(html_dir: Path) -> List[str]:
+    """Paths of the *.html pages in html_dir, from a single directory read."""
+    with os.scandir(html_dir) as entries:
+        return [entry.path for entry in entries
+                if entry.name.endswith('.html') and not entry.name.startswith('.')]
+
+def extract_fighter_data(tree: lxml.html.HtmlElement, fighter_data: Dict,
+                         division_keys: Tuple[str, str] = ('Division_Title', 'Division_Record')) -> Dict:
+    """Add every profile field found on a UFC athlete page to fighter_data and return it.
+
+    division_keys names the division title and record columns, which the
+    profiles CSV and the pipeline's CSV spell differently.
+    """
+    # Extract hero profile info
+    hero_info_div = _first(XP_HERO_INFO(tree))
+    if hero_info_div is not None:
+        # Basic info
+        name_elem = _first(XP_HERO_NAME(hero_info_div))
+        if name_elem is not None:
+            fighter_data['Name'] = name_elem.text_content().strip()
+        
+        # Division info
+        division_elem = _first(XP_HERO_DIVISION_TITLE(hero_info_div))
+        if division_elem is not None:
+            fighter_data[division_keys[0]] = division_elem.text_content().strip()
+        
+        # Record info
+        record_elem = _first(XP_HERO_DIVISION_BODY(hero_info_div))
+        if record_elem is not None:
+            fighter_data[division_keys[1]] = record_elem.text_content().strip()
+        
+        # Extract basic stats from hero section
+        stats = {}
+        for stat in XP_HERO_STATS(hero_info_div):
+            stat_text = _first(XP_HERO_STAT_TEXT(stat))
+            stat_numb = _first(XP_HERO_STAT_NUMB(stat))
+            if stat_text is not None and stat_numb is not None:
+                stats[stat_text.text_content().strip()] = stat_numb.text_content().strip()
+        fighter_data.update(stats)
+    
+    # Extract percentages from title tags
+    titles = TITLE_SEPARATOR.join(title.text_content() for title in XP_TITLES(tree))
+    fighter_data.update((match.group(1).strip(), match.group(2)) for match in PERCENT_RE.finditer(titles))
+    
+    # Extract carousel data (comprehensive stats)
+    carousel_div = _first(XP_CAROUSEL(tree))
+    if carousel_div is not None:
+        sections = _class_buckets(carousel_div, XP_CAROUSEL_SECTIONS, CAROUSEL_SECTION_CLASSES)
+        
+        # Basic carousel stats
+        carousel_stats = {}
+        for stat in sections['c-overlap__stats']:
+            try:
+                label = _first(XP_OVERLAP_STATS_TEXT(stat)).text_content().strip()
+                value = _first(XP_OVERLAP_STATS_VALUE(stat)).text_content().strip()
+                carousel_stats[label] = value
+            except AttributeError:
+                pass
+        fighter_data.update(carousel_stats)
+        
+        # Comparison stats
+        compare_stats = {}
+        for stat in sections['c-stat-compare__group']:
+            number_element = _first(XP_COMPARE_NUMBER(stat))
+            label_element = _first(XP_COMPARE_LABEL(stat))
+            percent_element = _first(XP_COMPARE_PERCENT(stat))
+            suffix_element = _first(XP_COMPARE_SUFFIX(stat))
+
+            if number_element is not None and label_element is not None:
+                number = _stripped_text(number_element)
+                label = _stripped_text(label_element)
+
+                if percent_element is not None and '%' not in number:
+                    percent = _stripped_text(percent_element)
+                    number += ' ' + percent
+
+                if suffix_element is not None:
+                    suffix = _stripped_text(suffix_element)
+                    label += ' ' + suffix
+
+                compare_stats[label] = number
+        fighter_data.update(compare_stats)
+        
+        # 3-bar stats
+        flat_bar_stats = {}
+        for element in sections['c-stat-3bar']:
+            try:
+                title = _first(XP_3BAR_TITLE(element)).text_content().strip()
+                for group in XP_3BAR_GROUPS(element):
+                    label = _first(XP_3BAR_LABEL(group)).text_content().strip()
+                    value = _first(XP_3BAR_VALUE(group)).text_content().strip()
+                    flat_key = f'{title} - {label}'
+                    flat_bar_stats[flat_key] = value
+            except AttributeError:
+                pass
+        fighter_data.update(flat_bar_stats)
+        
+        # Strike target data
+        sig_strike_stats = {}
+        title = _first(XP_STRIKE_TITLE(tree))
+        if title is not None:
+            try:
+                sig_str_target = _first(XP_STRIKE_TARGET(title)).text_content().strip()
+                head_stats = XP_SVG_TEXT(_first(XP_HEAD_TXT(tree)))
+                body_stats = XP_SVG_TEXT(_first(XP_BODY_TXT(tree)))
+                leg_stats = XP_SVG_TEXT(_first(XP_LEG_TXT(tree)))
+
+                sig_strike_stats[f'{sig_str_target} - Head Strike Percentage'] = head_stats[0].text_content().strip()
+                sig_strike_stats[f'{sig_str_target} - Head Strike Count'] = head_stats[1].text_content().strip()
+                sig_strike_stats[f'{sig_str_target} - Body Strike Percentage'] = body_stats[0].text_content().strip()
+                sig_strike_stats[f'{sig_str_target} - Body Strike Count'] = body_stats[1].text_content().strip()
+                sig_strike_stats[f'{sig_str_target} - Leg Strike Percentage'] = leg_stats[0].text_content().strip()
+                sig_strike_stats[f'{sig_str_target} - Leg Strike Count'] = leg_stats[1].text_content().strip()
+            except (AttributeError, TypeError):
+                pass
+        fighter_data.update(sig_strike_stats)
+        
+        # Fight history/events
+        fight_details = {}
+        event_count = 0
+
+        for event in XP_EVENTS(tree):
+            headline_tag = date_tag = None
+            result_sections = []
+            for part in XP_EVENT_PARTS(event):
+                if part.tag == 'h3':
+                    if headline_tag is None:
+                        headline_tag = part
+                    continue
+                classes = part.get('class', '').split()
+                if EVENT_RESULTS_CLASS in classes:
+                    result_sections.append([])
+                elif EVENT_DATE_CLASS in classes:
+                    if date_tag is None:
+                        date_tag = part
+                else:
+                    result_sections[-1].append(part)
+
+            headline = ' vs '.join([op.text_content().strip() for op in XP_LINKS(headline_tag)]) if headline_tag is not None else 'Headline not found'
+            date = date_tag.text_content().strip() if date_tag is not None else 'Date not found'
+
+            if headline != 'Headline not found' and date != 'Date not found':
+                event_count += 1
+                event_prefix = f'Event_{event_count}_'
+                fight_details[event_prefix + 'Headline'] = headline
+                fight_details[event_prefix + 'Date'] = date
+
+                for result_texts in result_sections:
+                    for label, result_text in zip(RESULT_LABELS, result_texts):
+                        fight_details[event_prefix + label] = result_text.text_content().strip()
+        fighter_data.update(fight_details)
+    
+    # Bio data extraction
+    bio_data = {}
+    for field in XP_BIO_FIELDS(tree):
+        try:
+            label = _stripped_text(_first(XP_BIO_LABEL(field)))
+            text = _stripped_text(_first(XP_BIO_TEXT(field)))
+            bio_data[label.replace(' ', '_')] = text
+        except AttributeError:
+            pass
+    fighter_data.update(bio_data)
+    
+    return fighter_data
+
+def _extract_section_rows(tree: lxml.html.HtmlElement) -> Dict[str, List[Dict]]:
+    """Rows of the ESPN striking/Clinch/Ground tables on one stats page."""
+    section_rows = {section: [] for section in SECTION_COLUMNS}
+    
+    player_name_elem = _first(XP_PLAYER_NAME(tree))
+    player_name = _stripped_text(player_name_elem) if player_name_elem is not None else 'Unknown Player'
+    
+    # One walk finds every section title; keep the first div per section
+    title_divs = {}
+    for div in XP_SECTION_TITLES(tree):
+        title_divs.setdefault(div.text_content(), div)
+    
+    for section, columns in SECTION_COLUMNS.items():
+        title_div = title_divs.get(section)
+        if title_div is None:
+            continue
+        table = _first(XP_NEXT_TABLE(title_div))
+        if table is None:
+            continue
+        for row in XP_ROWS(table)[1:]:  # Skip header
+            cols = [_stripped_text(td) for td in XP_CELLS(row)]
+            if len(cols) >= len(columns):
+                data = {'Player': player_name}
+                data.update(zip(columns, cols))
+                section_rows[section].append(data)
+    
+    return section_rows
+
+def parse_profile_page(path_str: str, profile: bool = True,
+                       sections: bool = False) -> Tuple[Optional[Dict], Dict[str, List[Dict]]]:
+    """Parse one HTML file once and run the requested extractors on it.
+
+    Returns the fighter profile dict (None if not requested or the file fails)
+    and the ESPN table rows per section (empty if not requested).
+    """
+    html_file = Path(path_str)
+    try:
+        # libxml2 reads the file itself, no intermediate Python string
+        tree = lxml.html.parse(path_str, parser=HTML_PARSER).getroot()
+        
+        fighter_data = None
+        if profile:
+            # Extract fighter name from filename
+            fighter_name = html_file.stem.replace('_', ' ')
+            fighter_data = FighterProfilesProcessor._extract_fighter_data_from_html(tree, fighter_name)
+        
+        return fighter_data, (_extract_section_rows(tree) if sections else {})
+    except Exception as e:
+        logging.error(f"Error processing {html_file}: {e}")
+        return None, {}
+
+def open_section_writers(stack: ExitStack) -> Dict[str, csv.DictWriter]:
+    """Open a CSV writer per ESPN section on SECTION_OUTPUT_FILES and write the headers."""
+    writers = {}
+    for section, columns in SECTION_COLUMNS.items():
+        f = stack.enter_context(open(SECTION_OUTPUT_FILES[section], 'w', newline='', encoding='utf-8'))
+        writers[section] = csv.DictWriter(f, fieldnames=['Player'] + columns, lineterminator='\n')
+        writers[section].writeheader()
+    return writers
+
+def log_section_counts(row_counts: Dict[str, int]) -> None:
+    for section, count in row_counts.items():
+        if not count:
+            logging.warning(f"No data found for section: {section}")
+        logging.info(f"Saved {section} data to {SECTION_OUTPUT_FILES[section]}")
+
 def main():
     """Main entry point for the fighter profiles processor."""
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('fighter_profiles_processor.log'),
+            logging.StreamHandler()
+        ]
+    )
+    
     # Create processor instance
     processor = FighterProfilesProcessor(html_dir='fighter_profiles')
     
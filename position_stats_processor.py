@@ -9,30 +9,201 @@ Dedicated script for processing fighter data and creating specialized CSV files:
 
 import pandas as pd
 from pathlib import Path
-from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 import logging
-from typing import Dict, List, Tuple, Optional
-from datetime import datetime
-import re
+from logging.handlers import MemoryHandler
+from typing import BinaryIO, Literal, Tuple, Optional, Union
+from datetime import date
 
-# Configure logging
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+    from pyarrow import feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Configure logging; file writes are buffered and flushed on errors or every 1000 records
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+log_file_handler = logging.FileHandler('position_stats_processor.log', delay=True)
+log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler('position_stats_processor.log'),
+        MemoryHandler(capacity=1000, flushLevel=logging.ERROR, target=log_file_handler),
         logging.StreamHandler()
     ]
 )
 
+# Text columns read as strings regardless of what their values look like
+TEXT_COLUMNS = (
+    'Name', 'Sig. Str. By Position - Standing', 'Sig. Str. By Position - Clinch',
+    'Sig. Str. By Position - Ground', 'Striking accuracy', 'SApM', 'Str. Def',
+    'TD Avg.', 'TD Acc.', 'TD Def.', 'Sub. Success Rate', 'Control Time',
+    'Ground Control %'
+)
+
+# Every fighter_profiles.csv column build_position_frames reads
+SOURCE_COLUMNS = frozenset(TEXT_COLUMNS) | {
+    'Sig. Str. Landed', 'Sig. Str. Attempted', 'Total Str. Landed', 'Total Str. Attempted',
+    'SLpM', 'Takedowns Landed', 'Takedowns Attempted', 'Sub. Avg.', 'Sub. Attempts',
+    'Reversals', 'Sweeps'
+}
+
+def read_csv(input_file: str) -> pd.DataFrame:
+    """Read a CSV into a DataFrame, using pyarrow's multi-threaded reader when it is installed."""
+    if not PYARROW_AVAILABLE:
+        return pd.read_csv(input_file)
+    
+    convert_options = pacsv.ConvertOptions(
+        column_types={col: pa.string() for col in TEXT_COLUMNS},
+        strings_can_be_null=True
+    )
+    return pacsv.read_csv(input_file, convert_options=convert_options).to_pandas()
+
+def infer_source_dtypes(input_file: str, batch_size: int) -> dict:
+    """Settle one dtype per source column across the whole file, reading batch_size rows at a time."""
+    # Batches inferred on their own disagree (an int column is float64 in any batch holding a null);
+    # numeric columns that disagree widen to float64 as a whole-file read does
+    seen = {}
+    for batch in pd.read_csv(input_file, usecols=lambda col: col in SOURCE_COLUMNS, chunksize=batch_size):
+        for col, dtype in batch.dtypes.items():
+            seen.setdefault(col, set()).add(dtype)
+    
+    dtypes = {}
+    for col, kinds in seen.items():
+        if col in TEXT_COLUMNS:
+            dtypes[col] = str
+        elif len(kinds) == 1:
+            dtypes[col] = kinds.pop()
+        elif all(pd.api.types.is_numeric_dtype(kind) and not pd.api.types.is_bool_dtype(kind) for kind in kinds):
+            dtypes[col] = 'float64'
+        else:
+            dtypes[col] = str
+    return dtypes
+
+def write_csv(df: pd.DataFrame, output_file: Union[str, BinaryIO], header: bool = True) -> None:
+    """Write a DataFrame to a CSV path or binary file, using pyarrow's writer when it is installed."""
+    if not PYARROW_AVAILABLE:
+        df.to_csv(output_file, index=False, header=header)
+        return
+    
+    # Format floats as to_csv does so values like 1.0 are not written as 1
+    float_columns = df.select_dtypes('float').columns
+    if len(float_columns):
+        df = df.assign(**{col: df[col].map(str, na_action='ignore') for col in float_columns})
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), output_file,
+                    pacsv.WriteOptions(include_header=header))
+
+def write_frame(df: pd.DataFrame, output_file: str, format: Literal['csv', 'feather', 'parquet'] = 'csv') -> str:
+    """Write a DataFrame as CSV, Feather or Parquet and return the path written."""
+    if format == 'csv':
+        write_csv(df, output_file)
+        return output_file
+    if format not in ('feather', 'parquet'):
+        raise ValueError(f"Unsupported output format: {format}")
+    if not PYARROW_AVAILABLE:
+        raise ImportError(f"pyarrow is required to write {format} files")
+    
+    output_file = str(Path(output_file).with_suffix(f'.{format}'))
+    if format == 'feather':
+        feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), output_file, compression='zstd')
+    else:
+        df.to_parquet(output_file, engine='pyarrow', compression='zstd', index=False)
+    return output_file
+
+def build_position_frames(df: pd.DataFrame, today: str) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Build the striking, ground and clinch frames from a batch of fighter profiles."""
+    
+    def column(name: str, default: str):
+        # Missing columns fall back to the same defaults the per-row .get() used
+        return df[name] if name in df.columns else default
+    
+    def constant(value: str) -> pd.Series:
+        # One dictionary entry plus int8 codes instead of a string per row
+        return pd.Series(value, index=df.index, dtype='category')
+    
+    # The output frames alias the source columns (copy=False) instead of copying them three times
+    not_available = constant('N/A')
+    base = {
+        'Player': column('Name', ''),
+        'Date': constant(today),
+        'Opponent': not_available,
+        'Event': not_available,
+        'Result': not_available
+    }
+    
+    # Extract striking data
+    accuracy = column('Striking accuracy', '0%')
+    striking_df = pd.DataFrame({
+        **base,
+        'SDBL/A': column('Sig. Str. By Position - Standing', '0/0'),
+        'SDHL/A': column('Sig. Str. By Position - Clinch', '0/0'),
+        'SDLL/A': column('Sig. Str. By Position - Ground', '0/0'),
+        'SL': column('Sig. Str. Landed', '0'),
+        'SA': column('Sig. Str. Attempted', '0'),
+        'TSL': column('Total Str. Landed', '0'),
+        'TSA': column('Total Str. Attempted', '0'),
+        'TSL-TSA': accuracy.map(str) if isinstance(accuracy, pd.Series) else accuracy,
+        'SLpM': column('SLpM', '0.00'),
+        'SApM': column('SApM', '0%'),
+        'Str. Def': column('Str. Def', '0%'),
+        'TD Avg.': column('TD Avg.', '0%'),
+        'TD Acc.': column('TD Acc.', '0%')
+    }, index=df.index, copy=False)
+    
+    # Extract ground data
+    ground_df = pd.DataFrame({
+        **base,
+        'TDL': column('Takedowns Landed', '0'),
+        'TDA': column('Takedowns Attempted', '0'),
+        'TD Acc.': column('TD Acc.', '0%'),
+        'TD Def.': column('TD Def.', '0%'),
+        'Sub. Avg.': column('Sub. Avg.', '0.0'),
+        'Sub. Attempts': column('Sub. Attempts', '0'),
+        'Sub. Success Rate': column('Sub. Success Rate', '0%'),
+        'Control Time': column('Control Time', '0'),
+        'Ground Control %': column('Ground Control %', '0%'),
+        'Reversals': column('Reversals', '0'),
+        'Sweeps': column('Sweeps', '0')
+    }, index=df.index, copy=False)
+    
+    # Extract clinch data; landed/attempted are the first two '/' parts
+    clinch = column('Sig. Str. By Position - Clinch', '0/0')
+    if isinstance(clinch, pd.Series):
+        parts = clinch.map(str).str.split('/', expand=True).reindex(columns=[0, 1])
+        has_pair = parts[1].notna()
+        landed = parts[0].where(has_pair, '0')
+        attempted = parts[1].where(has_pair, '0')
+        unpaired = int((~has_pair).sum())
+        if unpaired:
+            logging.info(f"{unpaired} fighters have no landed/attempted clinch pair; defaulting to 0")
+    else:
+        landed, attempted = '0', '0'
+    clinch_df = pd.DataFrame({
+        **base,
+        'Clinch_Strikes_Landed': landed,
+        'Clinch_Strikes_Attempted': attempted,
+        'Clinch_Accuracy': clinch,
+        'Clinch_Time_Control': column('Control Time', '0'),
+        'Clinch_Takedowns': column('Takedowns Landed', '0'),
+        'Clinch_Defense': column('TD Def.', '0%'),
+        'Clinch_Strikes_Per_Min': column('SLpM', '0.00'),
+        'Clinch_Position_Control': column('Ground Control %', '0%')
+    }, index=df.index, copy=False)
+    
+    return striking_df, ground_df, clinch_df
+
 class PositionStatsProcessor:
     """Process fighter data to create specialized position statistics CSV files."""
     
     def __init__(self, fighter_profiles_file: str = 'fighter_profiles.csv'):
         self.fighter_profiles_file = fighter_profiles_file
-        self.striking_records = []
-        self.ground_records = []
-        self.clinch_records = []
+        self.striking_df = pd.DataFrame()
+        self.ground_df = pd.DataFrame()
+        self.clinch_df = pd.DataFrame()
         self.success_count = 0
         self.failure_count = 0
 
@@ -43,76 +214,13 @@ class PositionStatsProcessor:
                 logging.error(f"Fighter profiles file {self.fighter_profiles_file} not found")
                 return None
             
-            df = pd.read_csv(self.fighter_profiles_file)
+            df = read_csv(self.fighter_profiles_file)
             logging.info(f"Loaded {len(df)} fighter profiles from {self.fighter_profiles_file}")
             return df
         except Exception as e:
             logging.error(f"Error loading fighter profiles: {e}")
             return None
 
-    def process_fighter_data(self, fighter_data: Dict) -> Tuple[Dict, Dict, Dict]:
-        """Process a single fighter's data into specialized records."""
-        # Extract striking data
-        striking_record = {
-            'Player': fighter_data.get('Name', ''),
-            'Date': datetime.now().strftime('%Y-%m-%d'),
-            'Opponent': 'N/A',
-            'Event': 'N/A',
-            'Result': 'N/A',
-            'SDBL/A': fighter_data.get('Sig. Str. By Position - Standing', '0/0'),
-            'SDHL/A': fighter_data.get('Sig. Str. By Position - Clinch', '0/0'),
-            'SDLL/A': fighter_data.get('Sig. Str. By Position - Ground', '0/0'),
-            'SL': fighter_data.get('Sig. Str. Landed', '0'),
-            'SA': fighter_data.get('Sig. Str. Attempted', '0'),
-            'TSL': fighter_data.get('Total Str. Landed', '0'),
-            'TSA': fighter_data.get('Total Str. Attempted', '0'),
-            'TSL-TSA': f"{fighter_data.get('Striking accuracy', '0%')}",
-            'SLpM': fighter_data.get('SLpM', '0.00'),
-            'SApM': fighter_data.get('SApM', '0%'),
-            'Str. Def': fighter_data.get('Str. Def', '0%'),
-            'TD Avg.': fighter_data.get('TD Avg.', '0%'),
-            'TD Acc.': fighter_data.get('TD Acc.', '0%')
-        }
-        
-        # Extract ground data
-        ground_record = {
-            'Player': fighter_data.get('Name', ''),
-            'Date': datetime.now().strftime('%Y-%m-%d'),
-            'Opponent': 'N/A',
-            'Event': 'N/A',
-            'Result': 'N/A',
-            'TDL': fighter_data.get('Takedowns Landed', '0'),
-            'TDA': fighter_data.get('Takedowns Attempted', '0'),
-            'TD Acc.': fighter_data.get('TD Acc.', '0%'),
-            'TD Def.': fighter_data.get('TD Def.', '0%'),
-            'Sub. Avg.': fighter_data.get('Sub. Avg.', '0.0'),
-            'Sub. Attempts': fighter_data.get('Sub. Attempts', '0'),
-            'Sub. Success Rate': fighter_data.get('Sub. Success Rate', '0%'),
-            'Control Time': fighter_data.get('Control Time', '0'),
-            'Ground Control %': fighter_data.get('Ground Control %', '0%'),
-            'Reversals': fighter_data.get('Reversals', '0'),
-            'Sweeps': fighter_data.get('Sweeps', '0')
-        }
-        
-        # Extract clinch data
-        clinch_record = {
-            'Player': fighter_data.get('Name', ''),
-            'Date': datetime.now().strftime('%Y-%m-%d'),
-            'Opponent': 'N/A',
-            'Event': 'N/A',
-            'Result': 'N/A',
-            'Clinch_Strikes_Landed': str(fighter_data.get('Sig. Str. By Position - Clinch', '0/0')).split('/')[0] if '/' in str(fighter_data.get('Sig. Str. By Position - Clinch', '0/0')) else '0',
-            'Clinch_Strikes_Attempted': str(fighter_data.get('Sig. Str. By Position - Clinch', '0/0')).split('/')[1] if '/' in str(fighter_data.get('Sig. Str. By Position - Clinch', '0/0')) else '0',
-            'Clinch_Accuracy': fighter_data.get('Sig. Str. By Position - Clinch', '0/0'),
-            'Clinch_Time_Control': fighter_data.get('Control Time', '0'),
-            'Clinch_Takedowns': fighter_data.get('Takedowns Landed', '0'),
-            'Clinch_Defense': fighter_data.get('TD Def.', '0%'),
-            'Clinch_Strikes_Per_Min': fighter_data.get('SLpM', '0.00'),
-            'Clinch_Position_Control': fighter_data.get('Ground Control %', '0%')
-        }
-        
-        return striking_record, ground_record, clinch_record
-
     def process_all_fighters(self) -> None:
         """Process all fighter data into specialized records."""
         df = self.load_fighter_data()
@@ -121,63 +229,83 @@ class PositionStatsProcessor:
         
         logging.info("Processing fighter data into specialized records...")
         
-        for _, fighter_row in tqdm(df.iterrows(), total=len(df), desc="Processing fighters"):
-            try:
-                fighter_data = fighter_row.to_dict()
-                
-                # Process fighter data into specialized records
-                striking_record, ground_record, clinch_record = self.process_fighter_data(fighter_data)
-                
-                # Add to respective lists
-                self.striking_records.append(striking_record)
-                self.ground_records.append(ground_record)
-                self.clinch_records.append(clinch_record)
-                
-                self.success_count += 1
-                
-            except Exception as e:
-                self.failure_count += 1
-                fighter_name = fighter_row.get('Name', 'Unknown')
-                logging.error(f"Error processing {fighter_name}: {e}")
-
-    def save_striking_data(self, output_file: str = 'striking_data.csv') -> None:
-        """Save striking data to CSV."""
-        if not self.striking_records:
+        self.striking_df, self.ground_df, self.clinch_df = build_position_frames(df, date.today().isoformat())
+        
+        self.success_count = len(df)
+
+    def save_striking_data(self, output_file: str = 'striking_data.csv', format: Literal['csv', 'feather', 'parquet'] = 'csv') -> None:
+        """Save striking data to CSV, or Feather/Parquet next to it."""
+        if self.striking_df.empty:
             logging.warning("No striking records to save")
             return
         
-        logging.info("Saving striking data to CSV...")
+        logging.info(f"Saving striking data to {format.upper()}...")
         
-        df_striking = pd.DataFrame(self.striking_records)
-        df_striking.to_csv(output_file, index=False)
+        output_file = write_frame(self.striking_df, output_file, format)
         
-        logging.info(f"Saved {len(self.striking_records)} striking records to {output_file}")
+        logging.info(f"Saved {len(self.striking_df)} striking records to {output_file}")
 
-    def save_ground_data(self, output_file: str = 'ground_data.csv') -> None:
-        """Save ground data to CSV."""
-        if not self.ground_records:
+    def save_ground_data(self, output_file: str = 'ground_data.csv', format: Literal['csv', 'feather', 'parquet'] = 'csv') -> None:
+        """Save ground data to CSV, or Feather/Parquet next to it."""
+        if self.ground_df.empty:
             logging.warning("No ground records to save")
             return
         
-        logging.info("Saving ground data to CSV...")
+        logging.info(f"Saving ground data to {format.upper()}...")
         
-        df_ground = pd.DataFrame(self.ground_records)
-        df_ground.to_csv(output_file, index=False)
+        output_file = write_frame(self.ground_df, output_file, format)
         
-        logging.info(f"Saved {len(self.ground_records)} ground records to {output_file}")
+        logging.info(f"Saved {len(self.ground_df)} ground records to {output_file}")
 
-    def save_clinch_data(self, output_file: str = 'clinch_data.csv') -> None:
-        """Save clinch data to CSV."""
-        if not self.clinch_records:
+    def save_clinch_data(self, output_file: str = 'clinch_data.csv', format: Literal['csv', 'feather', 'parquet'] = 'csv') -> None:
+        """Save clinch data to CSV, or Feather/Parquet next to it."""
+        if self.clinch_df.empty:
             logging.warning("No clinch records to save")
             return
         
-        logging.info("Saving clinch data to CSV...")
+        logging.info(f"Saving clinch data to {format.upper()}...")
         
-        df_clinch = pd.DataFrame(self.clinch_records)
-        df_clinch.to_csv(output_file, index=False)
+        output_file = write_frame(self.clinch_df, output_file, format)
         
-        logging.info(f"Saved {len(self.clinch_records)} clinch records to {output_file}")
+        logging.info(f"Saved {len(self.clinch_df)} clinch records to {output_file}")
+
+    def save_all(self, format: Literal['csv', 'feather', 'parquet'] = 'csv') -> None:
+        """Save all three record sets; the frames are independent so write them concurrently."""
+        savers = (self.save_striking_data, self.save_ground_data, self.save_clinch_data)
+        with ThreadPoolExecutor(max_workers=len(savers)) as executor:
+            for future in [executor.submit(save, format=format) for save in savers]:
+                future.result()
+
+    def stream_processor(self, batch_size: int = 65536) -> None:
+        """Process and write the three CSVs batch by batch so memory is bounded by batch_size."""
+        if not Path(self.fighter_profiles_file).exists():
+            logging.error(f"Fighter profiles file {self.fighter_profiles_file} not found")
+            return
+        
+        logging.info(f"Streaming {self.fighter_profiles_file} in batches of {batch_size}...")
+        
+        today = date.today().isoformat()
+        output_files = ('striking_data.csv', 'ground_data.csv', 'clinch_data.csv')
+        # Fix the dtypes once so every batch formats its values the way run_processor does
+        dtypes = infer_source_dtypes(self.fighter_profiles_file, batch_size)
+        with ExitStack() as stack:
+            sinks = None
+            for batch in pd.read_csv(self.fighter_profiles_file, usecols=list(dtypes), dtype=dtypes,
+                                     chunksize=batch_size):
+                if batch.empty:
+                    continue
+                # Open the outputs on the first batch so an empty input leaves no files behind
+                header = sinks is None
+                if header:
+                    sinks = [stack.enter_context(open(path, 'wb')) for path in output_files]
+                for sink, frame in zip(sinks, build_position_frames(batch, today)):
+                    write_csv(frame, sink, header=header)
+                self.success_count += len(batch)
+        
+        if sinks is None:
+            logging.warning("No fighter records to save")
+            return
+        logging.info(f"Streamed {self.success_count} records to {', '.join(output_files)}")
 
     def run_processor(self) -> None:
         """Run the position stats processor."""
@@ -187,16 +315,14 @@ class PositionStatsProcessor:
         self.process_all_fighters()
         
         # Save all specialized CSV files
-        self.save_striking_data()
-        self.save_ground_data()
-        self.save_clinch_data()
+        self.save_all()
         
         # Print summary
         logging.info(f"Position Stats Processor completed!")
         logging.info(f"Success: {self.success_count}, Failures: {self.failure_count}")
-        logging.info(f"Striking records: {len(self.striking_records)}")
-        logging.info(f"Ground records: {len(self.ground_records)}")
-        logging.info(f"Clinch records: {len(self.clinch_records)}")
+        logging.info(f"Striking records: {len(self.striking_df)}")
+        logging.info(f"Ground records: {len(self.ground_df)}")
+        logging.info(f"Clinch records: {len(self.clinch_df)}")
 
 def main():
     """Main entry point for the position stats processor."""
@@ -15,7 +15,7 @@ def main():
     # Create pipeline instance (no web scraping needed)
     pipeline = UFCFighterPipeline(
         output_dir='fighter_profiles',
-        max_workers=1,  # Not needed for file processing
+        max_workers=1,  # Only sizes scraping; HTML parsing uses every core
         rate_limit=0,   # Not needed for file processing
         max_retries=0,  # Not needed for file processing
         use_undetected=False  # Not needed for file processing
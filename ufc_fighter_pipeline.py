@@ -6,24 +6,27 @@ then processes it into specialized CSV files for striking, ground, and clinch da
 Uses advanced techniques to bypass Cloudflare protection.
 """
 
+import asyncio
+import httpx
 import requests
 import pandas as pd
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor
+from tqdm.asyncio import tqdm
 import os
-from bs4 import BeautifulSoup
+import lxml.html
 import time
 import logging
-from typing import Dict, List, Optional, Tuple
+from logging.handlers import MemoryHandler
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import json
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 import random
-from datetime import datetime
+from datetime import date
 import urllib.parse
-import re
+from functools import partial
+from dataclasses import dataclass, field
 import csv
+import socket
 
 # Advanced scraping imports for Cloudflare bypass
 try:
@@ -44,47 +47,100 @@ except ImportError:
     CLOUDSCRAPER_AVAILABLE = False
     logging.warning("cloudscraper not available, falling back to requests")
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 from fake_useragent import UserAgent
 
-# Configure logging
+from fighter_profiles_processor import HTML_PARSER, extract_fighter_data
+
+# Configure logging; file writes are buffered and flushed on errors or every 1000 records
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+log_file_handler = logging.FileHandler('ufc_scraper.log', delay=True)
+log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler('ufc_scraper.log'),
+        MemoryHandler(capacity=1000, flushLevel=logging.ERROR, target=log_file_handler),
         logging.StreamHandler()
     ]
 )
 
+@dataclass(slots=True)
+class MockResponse:
+    """Response-shaped wrapper around a page source fetched by the undetected driver."""
+    text: str
+    status_code: int = 200
+    content: bytes = field(init=False)
+    
+    def __post_init__(self):
+        self.content = self.text.encode('utf-8')
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"HTTP {self.status_code}")
+
+class FighterTarget(NamedTuple):
+    """URLs and HTML paths for one fighter, computed once before scraping."""
+    name: str
+    ufc_url: str
+    espn_url: str
+    ufc_html: Path
+    espn_html: Path
+
 class UFCFighterPipeline:
     """Unified UFC fighter data scraping and processing pipeline with Cloudflare bypass."""
     
+    UA_POOL_SIZE = 50
+    MAX_BACKOFF = 30
+    DRIVER_CONTENT_PREFS = {
+        'profile.managed_default_content_settings.images': 2,
+        'profile.managed_default_content_settings.stylesheets': 2,
+    }
+    DRIVER_BLOCKED_URLS = (
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg',
+        '*.woff', '*.woff2', '*.ttf', '*.css',
+        '*/ads/*', '*google-analytics*', '*googletagmanager*', '*doubleclick*',
+    )
+    DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    
     def __init__(self, output_dir: str = 'fighter_profiles', max_workers: int = 3, 
-                 rate_limit: float = 2.0, max_retries: int = 5, use_undetected: bool = True):
+                 rate_limit: float = 2.0, max_retries: int = 5, use_undetected: bool = True,
+                 cache_ttl: float = 7 * 24 * 3600):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.max_workers = max_workers
         self.rate_limit = rate_limit
         self.max_retries = max_retries
         self.use_undetected = use_undetected and UNDETECTED_AVAILABLE
+        self.cache_ttl = cache_ttl  # Seconds a saved UFC page is reused instead of re-fetched
         
-        # Initialize user agent generator
+        # Snapshot a pool of user agents once; rotation then only picks from a tuple
         try:
             self.ua = UserAgent()
+            self._ua_pool = tuple(dict.fromkeys(self.ua.random for _ in range(self.UA_POOL_SIZE)))
         except:
             self.ua = None
+            self._ua_pool = ()
         
-        # Initialize sessions
-        self.session = self._create_session()
+        # Initialize sessions; the httpx client and locks are created inside the event loop by scrape_fighters
+        self._client: Optional[httpx.AsyncClient] = None
+        self._rate_lock: Optional[asyncio.Lock] = None
+        self._driver_slots: Optional[asyncio.Semaphore] = None
         self.cloudscraper_session = self._create_cloudscraper_session() if CLOUDSCRAPER_AVAILABLE else None
-        self.driver = None
+        self._drivers = []  # Idle undetected drivers, started on demand and kept until cleanup
         
         # Statistics tracking
         self.success_count = 0
         self.failure_count = 0
-        self.last_request_time = 0
+        self.last_request_time = 0.0  # time.monotonic() readings; immune to wall-clock jumps
         self.requests_this_minute = 0
-        self.minute_start = datetime.now()
+        self.minute_start = time.monotonic()
         
         # Data storage
         self.fighter_profiles = []
@@ -92,42 +148,34 @@ class UFCFighterPipeline:
         self.ground_data = []
         self.clinch_data = []
 
-    def _create_session(self) -> requests.Session:
-        """Create a requests session with retry strategy and headers."""
-        session = requests.Session()
-        
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=2,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"]
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create one pooled HTTP/2 client shared by every UFC.com fetch."""
+        # TCP_NODELAY keeps small GETs from stalling on Nagle/delayed-ACK, and the
+        # keep-alive pool is sized so no worker has to reconnect between fighters
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=self.max_workers * 4),
+            socket_options=[
+                (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+        )
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=15,
+            follow_redirects=True,
+            headers={
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.5',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'DNT': '1',
+                'Upgrade-Insecure-Requests': '1',
+                'Sec-Fetch-Dest': 'document',
+                'Sec-Fetch-Mode': 'navigate',
+                'Sec-Fetch-Site': 'none',
+                'Cache-Control': 'max-age=0'
+            }
         )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("https://", adapter)
-        session.mount("http://", adapter)
-        
-        # Use fake user agent if available
-        if self.ua:
-            user_agent = self.ua.random
-        else:
-            user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        
-        session.headers.update({
-            'User-Agent': user_agent,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0'
-        })
-        
-        return session
 
     def _create_cloudscraper_session(self) -> cloudscraper.CloudScraper:
         """Create a cloudscraper session for bypassing Cloudflare."""
@@ -142,8 +190,8 @@ class UFCFighterPipeline:
             }
         )
         
-        if self.ua:
-            scraper.headers['User-Agent'] = self.ua.random
+        if self._ua_pool:
+            scraper.headers['User-Agent'] = random.choice(self._ua_pool)
         
         return scraper
 
@@ -161,119 +209,127 @@ class UFCFighterPipeline:
             options.add_argument('--disable-features=VizDisplayCompositor')
             options.add_argument('--disable-extensions')
             options.add_argument('--disable-plugins')
-            options.add_argument('--disable-images')
-            options.add_argument('--disable-javascript')  # We'll enable if needed
+            # Chrome has no --disable-images/--disable-javascript switches; block assets through content settings instead
+            options.add_experimental_option('prefs', self.DRIVER_CONTENT_PREFS)
             
-            if self.ua:
-                options.add_argument(f'--user-agent={self.ua.random}')
+            if self._ua_pool:
+                options.add_argument(f'--user-agent={random.choice(self._ua_pool)}')
             
             driver = uc.Chrome(options=options, version_main=None)
             driver.set_page_load_timeout(30)
+            
+            # Drop assets the stats DOM doesn't need before they are downloaded
+            try:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(self.DRIVER_BLOCKED_URLS)})
+            except Exception as e:
+                logging.warning(f"Failed to set blocked URLs on undetected driver: {e}")
             return driver
         except Exception as e:
             logging.warning(f"Failed to initialize undetected driver: {e}")
             return None
 
-    def _rotate_user_agent(self):
-        """Rotate user agent to avoid detection."""
-        if self.ua:
-            new_ua = self.ua.random
-            self.session.headers['User-Agent'] = new_ua
-            if self.cloudscraper_session:
-                self.cloudscraper_session.headers['User-Agent'] = new_ua
+    def _rotate_user_agent(self) -> str:
+        """Rotate user agent to avoid detection and return the one to send."""
+        if not self._ua_pool:
+            return self.DEFAULT_USER_AGENT
+        new_ua = random.choice(self._ua_pool)
+        if self.cloudscraper_session:
+            self.cloudscraper_session.headers['User-Agent'] = new_ua
+        return new_ua
 
-    def _rate_limit_wait(self):
+    async def _rate_limit_wait(self):
         """Implement rate limiting to respect server limits."""
-        current_time = datetime.now()
-        
-        if (current_time - self.minute_start).total_seconds() >= 60:
-            self.requests_this_minute = 0
-            self.minute_start = current_time
-        
-        if self.requests_this_minute >= 25:
-            sleep_time = 60 - (current_time - self.minute_start).total_seconds()
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-                self.minute_start = datetime.now()
+        # Concurrent fetches take turns so the per-minute budget and spacing stay global
+        async with self._rate_lock:
+            current_time = time.monotonic()
+            
+            if current_time - self.minute_start >= 60:
                 self.requests_this_minute = 0
-        
-        time_since_last = time.time() - self.last_request_time
-        if time_since_last < self.rate_limit:
-            time.sleep(self.rate_limit - time_since_last)
-        
-        self.last_request_time = time.time()
-        self.requests_this_minute += 1
+                self.minute_start = current_time
+            
+            if self.requests_this_minute >= 25:
+                sleep_time = 60 - (current_time - self.minute_start)
+                if sleep_time > 0:
+                    await asyncio.sleep(sleep_time)
+                    self.minute_start = time.monotonic()
+                    self.requests_this_minute = 0
+            
+            time_since_last = time.monotonic() - self.last_request_time
+            if time_since_last < self.rate_limit:
+                await asyncio.sleep(self.rate_limit - time_since_last)
+            
+            self.last_request_time = time.monotonic()
+            self.requests_this_minute += 1
 
-    def _make_request(self, url: str, retries: int = 0) -> Optional[requests.Response]:
+    async def _make_request(self, url: str) -> Optional[httpx.Response]:
         """Make HTTP request with rate limiting and retry logic, with Cloudflare bypass."""
-        try:
-            self._rate_limit_wait()
-            self._rotate_user_agent()
-            
-            # Try regular requests first
+        for attempt in range(self.max_retries + 1):
             try:
-                response = self.session.get(url, timeout=15)
-                response.raise_for_status()
-                return response
-            except requests.exceptions.RequestException as e:
-                logging.warning(f"Regular request failed for {url}: {e}")
-                
-                # Try cloudscraper if available
-                if self.cloudscraper_session:
-                    try:
-                        logging.info(f"Attempting cloudscraper for {url}")
-                        response = self.cloudscraper_session.get(url, timeout=20)
-                        response.raise_for_status()
-                        return response
-                    except Exception as e2:
-                        logging.warning(f"Cloudscraper failed for {url}: {e2}")
+                await self._rate_limit_wait()
+                user_agent = self._rotate_user_agent()
                 
-                # Try undetected driver as last resort
-                if self.use_undetected and UNDETECTED_AVAILABLE:
-                    try:
-                        logging.info(f"Attempting undetected driver for {url}")
-                        return self._make_request_with_driver(url)
-                    except Exception as e3:
-                        logging.warning(f"Undetected driver failed for {url}: {e3}")
+                # Try the pooled httpx client first
+                try:
+                    response = await self._client.get(url, headers={'User-Agent': user_agent})
+                    response.raise_for_status()
+                    return response
+                except httpx.HTTPError as e:
+                    logging.warning(f"Regular request failed for {url}: {e}")
+                    
+                    # Try cloudscraper if available; it is blocking, so run it off the event loop
+                    if self.cloudscraper_session:
+                        try:
+                            logging.info(f"Attempting cloudscraper for {url}")
+                            response = await asyncio.to_thread(self.cloudscraper_session.get, url, timeout=20)
+                            response.raise_for_status()
+                            return response
+                        except Exception as e2:
+                            logging.warning(f"Cloudscraper failed for {url}: {e2}")
+                    
+                    # Try undetected driver as last resort
+                    if self.use_undetected and UNDETECTED_AVAILABLE:
+                        try:
+                            logging.info(f"Attempting undetected driver for {url}")
+                            return await self._make_request_with_pooled_driver(url)
+                        except Exception as e3:
+                            logging.warning(f"Undetected driver failed for {url}: {e3}")
+                    
+                    raise e
                 
-                raise e
-            
-        except requests.exceptions.RequestException as e:
-            if retries < self.max_retries:
-                logging.warning(f"Request failed for {url}, retrying ({retries + 1}/{self.max_retries}): {e}")
-                time.sleep(2 ** retries)  # Exponential backoff
-                return self._make_request(url, retries + 1)
-            else:
-                logging.error(f"Failed to fetch {url} after {self.max_retries} retries: {e}")
+            except httpx.HTTPError as e:
+                if attempt < self.max_retries:
+                    logging.warning(f"Request failed for {url}, retrying ({attempt + 1}/{self.max_retries}): {e}")
+                    # Capped exponential backoff with jitter so concurrent retries don't line up
+                    await asyncio.sleep(min(2 ** attempt, self.MAX_BACKOFF) + random.random())
+                else:
+                    logging.error(f"Failed to fetch {url} after {self.max_retries} retries: {e}")
+        return None
+
+    async def _make_request_with_pooled_driver(self, url: str) -> Optional[MockResponse]:
+        """Fetch through an idle driver, starting another only while fewer than max_workers exist."""
+        async with self._driver_slots:
+            driver = self._drivers.pop() if self._drivers else await asyncio.to_thread(self._init_undetected_driver)
+            if driver is None:
                 return None
+            try:
+                return await asyncio.to_thread(self._make_request_with_driver, driver, url)
+            finally:
+                self._drivers.append(driver)
 
-    def _make_request_with_driver(self, url: str) -> Optional[requests.Response]:
+    @staticmethod
+    def _make_request_with_driver(driver, url: str) -> Optional[MockResponse]:
         """Make request using undetected Chrome driver."""
-        if not self.driver:
-            self.driver = self._init_undetected_driver()
-            if not self.driver:
-                return None
-        
         try:
-            self.driver.get(url)
+            driver.get(url)
             
             # Wait for page to load
-            WebDriverWait(self.driver, 10).until(
+            WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
             # Get page source
-            page_source = self.driver.page_source
-            
-            # Create a mock response object
-            class MockResponse:
-                def __init__(self, text, status_code=200):
-                    self.text = text
-                    self.status_code = status_code
-                
-                def raise_for_status(self):
-                    if self.status_code >= 400:
-                        raise requests.exceptions.HTTPError(f"HTTP {self.status_code}")
+            page_source = driver.page_source
             
             return MockResponse(page_source)
             
@@ -281,50 +337,75 @@ class UFCFighterPipeline:
             logging.error(f"Driver request failed for {url}: {e}")
             return None
 
-    def scrape_ufc_profile(self, fighter_name: str) -> Optional[Dict]:
+    def _prepare_targets(self, fighters: List[str]) -> List[FighterTarget]:
+        """Build each fighter's URLs and HTML paths once, before any request is made."""
+        targets = []
+        for fighter_name in fighters:
+            formatted_name = urllib.parse.quote(fighter_name.lower().replace(' ', '-'))
+            file_stem = fighter_name.replace(' ', '_')
+            targets.append(FighterTarget(
+                name=fighter_name,
+                ufc_url=f"https://www.ufc.com/athlete/{formatted_name}",
+                # ESPN URL format (this would need to be adjusted based on ESPN's actual URL structure)
+                espn_url=f"https://www.espn.com/mma/fighter/_/name/{formatted_name}",
+                ufc_html=self.output_dir / f"{file_stem}_ufc.html",
+                espn_html=self.output_dir / f"{file_stem}_espn.html",
+            ))
+        return targets
+
+    @staticmethod
+    async def _save_html(html_file: Path, content: bytes) -> None:
+        """Write the raw page bytes off the event loop so requests keep flowing while the disk catches up."""
+        await asyncio.to_thread(html_file.write_bytes, content)
+
+    def _is_fresh(self, html_file: Path) -> bool:
+        """Whether a previously saved page is younger than cache_ttl."""
+        try:
+            return time.time() - html_file.stat().st_mtime < self.cache_ttl
+        except FileNotFoundError:
+            return False
+
+    async def scrape_ufc_profile(self, target: FighterTarget) -> Optional[Dict]:
         """Scrape comprehensive fighter data from UFC.com using A1 techniques."""
         try:
-            # Format fighter name for URL
-            formatted_name = urllib.parse.quote(fighter_name.lower().replace(' ', '-'))
-            url = f"https://www.ufc.com/athlete/{formatted_name}"
+            # A fresh copy from an earlier run skips the request entirely
+            if self._is_fresh(target.ufc_html):
+                logging.debug("Using cached UFC page for %s", target.name)
+                tree = (await asyncio.to_thread(lxml.html.parse, str(target.ufc_html), HTML_PARSER)).getroot()
+                fighter_data = self._extract_fighter_data_from_html(tree, target.name)
+                if fighter_data:
+                    fighter_data['Source'] = 'UFC.com'
+                return fighter_data
             
-            response = self._make_request(url)
+            response = await self._make_request(target.ufc_url)
             if not response:
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            tree = lxml.html.fromstring(response.content, parser=HTML_PARSER)
             
             # Use the same comprehensive extraction as HTML processing
-            fighter_data = self._extract_fighter_data_from_html(soup, fighter_name)
+            fighter_data = self._extract_fighter_data_from_html(tree, target.name)
             if fighter_data:
                 fighter_data['Source'] = 'UFC.com'  # Override source
             
             # Save HTML for later processing
-            html_file = self.output_dir / f"{fighter_name.replace(' ', '_')}_ufc.html"
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(response.text)
+            await self._save_html(target.ufc_html, response.content)
             
             return fighter_data
             
         except Exception as e:
-            logging.error(f"Error scraping UFC profile for {fighter_name}: {e}")
+            logging.error(f"Error scraping UFC profile for {target.name}: {e}")
             return None
 
-    def scrape_espn_profile(self, fighter_name: str) -> Optional[Dict]:
+    async def scrape_espn_profile(self, target: FighterTarget) -> Optional[Dict]:
         """Scrape fighter data from ESPN."""
         try:
-            # ESPN URL format (this would need to be adjusted based on ESPN's actual URL structure)
-            formatted_name = urllib.parse.quote(fighter_name.lower().replace(' ', '-'))
-            url = f"https://www.espn.com/mma/fighter/_/name/{formatted_name}"
-            
-            response = self._make_request(url)
+            response = await self._make_request(target.espn_url)
             if not response:
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
             fighter_data = {
-                'Name': fighter_name,
+                'Name': target.name,
                 'Source': 'ESPN'
             }
             
@@ -332,24 +413,23 @@ class UFCFighterPipeline:
             # This would need to be customized based on ESPN's HTML structure
             
             # Save HTML for later processing
-            html_file = self.output_dir / f"{fighter_name.replace(' ', '_')}_espn.html"
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(response.text)
+            await self._save_html(target.espn_html, response.content)
             
             return fighter_data
             
         except Exception as e:
-            logging.error(f"Error scraping ESPN profile for {fighter_name}: {e}")
+            logging.error(f"Error scraping ESPN profile for {target.name}: {e}")
             return None
 
-    def process_fighter_data(self, fighter_data: Dict) -> Tuple[Dict, List, List, List]:
-        """Process raw fighter data into specialized datasets."""
+    @staticmethod
+    def process_fighter_data(fighter_data: Dict, today: str) -> Tuple[Dict, List, List, List]:
+        """Process raw fighter data into specialized datasets dated `today` (YYYY-MM-DD)."""
         profile = fighter_data.copy()
         
         # Extract striking data
         striking_record = {
             'Player': fighter_data.get('Name', ''),
-            'Date': datetime.now().strftime('%Y-%m-%d'),
+            'Date': today,
             'Opponent': 'N/A',
             'Event': 'N/A',
             'Result': 'N/A',
@@ -370,7 +450,7 @@ class UFCFighterPipeline:
         # Extract ground data
         ground_record = {
             'Player': fighter_data.get('Name', ''),
-            'Date': datetime.now().strftime('%Y-%m-%d'),
+            'Date': today,
             'Opponent': 'N/A',
             'Event': 'N/A',
             'Result': 'N/A',
@@ -391,7 +471,7 @@ class UFCFighterPipeline:
         # Extract clinch data
         clinch_record = {
             'Player': fighter_data.get('Name', ''),
-            'Date': datetime.now().strftime('%Y-%m-%d'),
+            'Date': today,
             'Opponent': 'N/A',
             'Event': 'N/A',
             'Result': 'N/A',
@@ -417,217 +497,38 @@ class UFCFighterPipeline:
         html_files = list(html_path.glob('*.html'))
         logging.info(f"Found {len(html_files)} HTML files to process")
         
-        for html_file in tqdm(html_files, desc="Processing HTML files"):
-            try:
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-                
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                # Extract fighter name from filename
+        # Parsing is CPU-bound, so pages are spread over every core; max_workers
+        # only sizes the scraping concurrency
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = executor.map(partial(_process_html_file, today=date.today().isoformat()), html_files, chunksize=8)
+            for html_file, (records, error) in tqdm(zip(html_files, results), total=len(html_files),
+                                                    desc="Processing HTML files"):
                 fighter_name = html_file.stem.replace('_', ' ')
-                
-                # Extract fighter data using the same logic as scraping
-                fighter_data = self._extract_fighter_data_from_html(soup, fighter_name)
-                
-                if fighter_data:
-                    profile, striking, ground, clinch = self.process_fighter_data(fighter_data)
+                if error is not None:
+                    self.failure_count += 1
+                    logging.error(f"Error processing {html_file}: {error}")
+                elif records:
+                    profile, striking, ground, clinch = records
                     self.fighter_profiles.append(profile)
                     self.striking_data.extend(striking)
                     self.ground_data.extend(ground)
                     self.clinch_data.extend(clinch)
                     self.success_count += 1
-                    logging.info(f"Processed {fighter_name} from HTML file")
+                    logging.debug("Processed %s from HTML file", fighter_name)
                 else:
                     self.failure_count += 1
                     logging.warning(f"Failed to extract data from {fighter_name}")
-                    
-            except Exception as e:
-                self.failure_count += 1
-                logging.error(f"Error processing {html_file}: {e}")
 
-    def _extract_fighter_data_from_html(self, soup: BeautifulSoup, fighter_name: str) -> Optional[Dict]:
+    @staticmethod
+    def _extract_fighter_data_from_html(tree: lxml.html.HtmlElement, fighter_name: str) -> Optional[Dict]:
         """Extract comprehensive fighter data from HTML content using A1 techniques."""
         fighter_data = {
             'Name': fighter_name,
             'Source': 'HTML File'
         }
-        
-        # Extract hero profile info
-        hero_info_div = soup.find(class_='hero-profile__info')
-        if hero_info_div:
-            # Basic info
-            try:
-                name_elem = hero_info_div.find(class_='hero-profile__name')
-                if name_elem:
-                    fighter_data['Name'] = name_elem.text.strip()
-            except AttributeError:
-                pass
-            
-            # Division info
-            try:
-                division_elem = hero_info_div.find(class_='hero-profile__division-title')
-                if division_elem:
-                    fighter_data['Division Title'] = division_elem.text.strip()
-            except AttributeError:
-                pass
-            
-            # Record info
-            try:
-                record_elem = hero_info_div.find(class_='hero-profile__division-body')
-                if record_elem:
-                    fighter_data['Division Record'] = record_elem.text.strip()
-            except AttributeError:
-                pass
-            
-            # Extract basic stats from hero section
-            stats = {}
-            for stat in hero_info_div.find_all(class_='hero-profile__stat'):
-                try:
-                    stat_text = stat.find(class_='hero-profile__stat-text')
-                    stat_numb = stat.find(class_='hero-profile__stat-numb')
-                    if stat_text and stat_numb:
-                        stats[stat_text.text.strip()] = stat_numb.text.strip()
-                except AttributeError:
-                    pass
-            fighter_data.update(stats)
-        
-        # Extract percentages from title tags
-        percentages = {}
-        titles = soup.find_all('title')
-        pattern = re.compile(r'\d+%')
-        for title in titles:
-            try:
-                text = title.text.strip()
-                match = pattern.search(text)
-                if match:
-                    key = text.split(match.group())[0].strip()
-                    percentages[key] = match.group()
-            except:
-                pass
-        fighter_data.update(percentages)
-        
-        # Extract carousel data (comprehensive stats)
-        carousel_div = soup.find("div", class_="c-carousel--multiple__content carousel__multiple-items stats-records-inner-wrap")
-        if carousel_div:
-            # Basic carousel stats
-            carousel_stats = {}
-            stats_class = carousel_div.find_all(class_="c-overlap__stats")
-            for stat in stats_class:
-                try:
-                    label = stat.find(class_="c-overlap__stats-text").text.strip()
-                    value = stat.find(class_="c-overlap__stats-value").text.strip()
-                    carousel_stats[label] = value
-                except AttributeError:
-                    pass
-            fighter_data.update(carousel_stats)
-            
-            # Comparison stats
-            compare_stats = {}
-            stats_class = carousel_div.find_all(class_="c-stat-compare__group")
-            for stat in stats_class:
-                try:
-                    number_element = stat.find(class_='c-stat-compare__number')
-                    label_element = stat.find(class_='c-stat-compare__label')
-                    percent_element = stat.find(class_='c-stat-compare__percent')
-                    suffix_element = stat.find(class_='c-stat-compare__label-suffix')
-
-                    if number_element and label_element:
-                        number = number_element.get_text(strip=True)
-                        label = label_element.get_text(strip=True)
-
-                        if percent_element and '%' not in number:
-                            percent = percent_element.get_text(strip=True)
-                            number += ' ' + percent
-
-                        if suffix_element:
-                            suffix = suffix_element.get_text(strip=True)
-                            label += ' ' + suffix
-
-                        compare_stats[label] = number
-                except AttributeError:
-                    pass
-            fighter_data.update(compare_stats)
-            
-            # 3-bar stats
-            flat_bar_stats = {}
-            c_stat_3bar = carousel_div.find_all(class_="c-stat-3bar")
-            for element in c_stat_3bar:
-                try:
-                    title = element.find("h2", class_="c-stat-3bar__title").text.strip()
-                    groups = element.find_all("div", class_="c-stat-3bar__group")
-                    for group in groups:
-                        label = group.find("div", class_="c-stat-3bar__label").text.strip()
-                        value = group.find("div", class_="c-stat-3bar__value").text.strip()
-                        flat_key = f'{title} - {label}'
-                        flat_bar_stats[flat_key] = value
-                except AttributeError:
-                    pass
-            fighter_data.update(flat_bar_stats)
-            
-            # Strike target data
-            sig_strike_stats = {}
-            title = soup.find("div", class_="c-stat-body__title")
-            if title:
-                try:
-                    sig_str_target = title.find(class_="e-t5").text.strip()
-                    head_stats = soup.find(id="e-stat-body_x5F__x5F_head-txt").find_all("text")
-                    body_stats = soup.find(id="e-stat-body_x5F__x5F_body-txt").find_all("text")
-                    leg_stats = soup.find(id="e-stat-body_x5F__x5F_leg-txt").find_all("text")
-
-                    sig_strike_stats[f'{sig_str_target} - Head Strike Percentage'] = head_stats[0].text.strip()
-                    sig_strike_stats[f'{sig_str_target} - Head Strike Count'] = head_stats[1].text.strip()
-                    sig_strike_stats[f'{sig_str_target} - Body Strike Percentage'] = body_stats[0].text.strip()
-                    sig_strike_stats[f'{sig_str_target} - Body Strike Count'] = body_stats[1].text.strip()
-                    sig_strike_stats[f'{sig_str_target} - Leg Strike Percentage'] = leg_stats[0].text.strip()
-                    sig_strike_stats[f'{sig_str_target} - Leg Strike Count'] = leg_stats[1].text.strip()
-                except AttributeError:
-                    pass
-            fighter_data.update(sig_strike_stats)
-            
-            # Fight history/events
-            events = soup.find_all('li', class_='l-listing__item')
-            fight_details = {}
-            event_count = 0
-
-            for event in events:
-                try:
-                    headline_tag = event.find('h3', class_='c-card-event--athlete-results__headline')
-                    date_tag = event.find('div', class_='c-card-event--athlete-results__date')
-                    results_sections = event.find_all('div', class_='c-card-event--athlete-results__results')
-
-                    headline = ' vs '.join([op.text.strip() for op in headline_tag.find_all('a')]) if headline_tag else 'Headline not found'
-                    date = date_tag.text.strip() if date_tag else 'Date not found'
-
-                    if headline != 'Headline not found' and date != 'Date not found':
-                        event_count += 1
-                        event_prefix = f'Event_{event_count}_'
-                        fight_details[event_prefix + 'Headline'] = headline
-                        fight_details[event_prefix + 'Date'] = date
-
-                        for index, section in enumerate(results_sections):
-                            result_texts = section.find_all('div', class_='c-card-event--athlete-results__result-text')
-                            labels = ['Round', 'Time', 'Method']
-                            for j, result_text in enumerate(result_texts):
-                                if j < len(labels):
-                                    fight_details[event_prefix + labels[j]] = result_text.text.strip()
-                except AttributeError:
-                    pass
-            fighter_data.update(fight_details)
-        
-        # Bio data extraction
-        fields = soup.find_all("div", class_="c-bio__field")
-        bio_data = {}
-        for field in fields:
-            try:
-                label = field.find("div", class_="c-bio__label").get_text(strip=True)
-                text = field.find("div", class_="c-bio__text").get_text(strip=True)
-                bio_data[label.replace(' ', '_')] = text
-            except AttributeError:
-                pass
-        fighter_data.update(bio_data)
-        
-        return fighter_data
+        # Same compiled-XPath extraction as the profiles processor; this
+        # pipeline's CSV names the division columns with spaces
+        return extract_fighter_data(tree, fighter_data, division_keys=('Division Title', 'Division Record'))
 
 
 
@@ -637,31 +538,46 @@ class UFCFighterPipeline:
         
         # Step 1: UFC Scraping
         logging.info("Step 1: Scraping UFC profiles...")
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit UFC scraping tasks
-            ufc_futures = {executor.submit(self.scrape_ufc_profile, fighter): fighter for fighter in fighters}
-            
-            # Process completed UFC tasks
-            for future in tqdm(ufc_futures, desc="Scraping UFC profiles"):
-                fighter_name = ufc_futures[future]
-                try:
-                    fighter_data = future.result()
-                    if fighter_data:
-                        self.success_count += 1
-                        profile, striking, ground, clinch = self.process_fighter_data(fighter_data)
-                        self.fighter_profiles.append(profile)
-                        logging.info(f"Successfully scraped UFC profile for {fighter_name}")
-                    else:
-                        self.failure_count += 1
-                        logging.warning(f"Failed to scrape UFC profile for {fighter_name}")
-                except Exception as e:
+        ufc_results = asyncio.run(self._scrape_ufc_profiles(fighters))
+        
+        # Process completed UFC tasks
+        today = date.today().isoformat()
+        for fighter_name, fighter_data in zip(fighters, ufc_results):
+            try:
+                if fighter_data:
+                    self.success_count += 1
+                    profile, striking, ground, clinch = self.process_fighter_data(fighter_data, today)
+                    self.fighter_profiles.append(profile)
+                    logging.debug("Successfully scraped UFC profile for %s", fighter_name)
+                else:
                     self.failure_count += 1
-                    logging.error(f"Error processing UFC profile for {fighter_name}: {e}")
+                    logging.warning(f"Failed to scrape UFC profile for {fighter_name}")
+            except Exception as e:
+                self.failure_count += 1
+                logging.error(f"Error processing UFC profile for {fighter_name}: {e}")
         
         # Step 2: ESPN Scraping
         logging.info("Step 2: Scraping ESPN profiles for per-fight data...")
         self.scrape_espn_fighters(fighters)
     
+    async def _scrape_ufc_profiles(self, fighters: List[str]) -> List[Optional[Dict]]:
+        """Fetch every UFC profile over one pooled client, max_workers at a time."""
+        self._rate_lock = asyncio.Lock()
+        self._driver_slots = asyncio.Semaphore(self.max_workers)
+        semaphore = asyncio.Semaphore(self.max_workers)
+        
+        async def scrape(target: FighterTarget) -> Optional[Dict]:
+            async with semaphore:
+                return await self.scrape_ufc_profile(target)
+        
+        targets = self._prepare_targets(fighters)
+        async with self._create_client() as client:
+            self._client = client
+            try:
+                return await tqdm.gather(*(scrape(target) for target in targets), desc="Scraping UFC profiles")
+            finally:
+                self._client = None
+    
     def scrape_espn_fighters(self, fighters: List[str]) -> None:
         """Scrape ESPN data for per-fight statistics."""
         try:
@@ -706,24 +622,20 @@ class UFCFighterPipeline:
         
         # Save fighter profiles (UFC career data)
         if self.fighter_profiles:
-            df_profiles = pd.DataFrame(self.fighter_profiles)
-            df_profiles.to_csv('fighter_profiles.csv', index=False)
+            write_records(self.fighter_profiles, 'fighter_profiles.csv')
             logging.info(f"Saved {len(self.fighter_profiles)} UFC fighter profiles (career data)")
         
         # Save ESPN per-fight data (replaces UFC career totals)
         if self.striking_data:
-            df_striking = pd.DataFrame(self.striking_data)
-            df_striking.to_csv('striking_data.csv', index=False)
+            write_records(self.striking_data, 'striking_data.csv')
             logging.info(f"Saved {len(self.striking_data)} ESPN striking records (per-fight data)")
         
         if self.ground_data:
-            df_ground = pd.DataFrame(self.ground_data)
-            df_ground.to_csv('ground_data.csv', index=False)
+            write_records(self.ground_data, 'ground_data.csv')
             logging.info(f"Saved {len(self.ground_data)} ESPN ground records (per-fight data)")
         
         if self.clinch_data:
-            df_clinch = pd.DataFrame(self.clinch_data)
-            df_clinch.to_csv('clinch_data.csv', index=False)
+            write_records(self.clinch_data, 'clinch_data.csv')
             logging.info(f"Saved {len(self.clinch_data)} ESPN clinch records (per-fight data)")
         
         # Log data source information
@@ -735,9 +647,9 @@ class UFCFighterPipeline:
 
     def cleanup(self):
         """Clean up resources."""
-        if self.driver:
+        while self._drivers:
             try:
-                self.driver.quit()
+                self._drivers.pop().quit()
                 logging.info("Closed undetected driver")
             except:
                 pass
@@ -792,6 +704,43 @@ class UFCFighterPipeline:
         # Cleanup
         self.cleanup()
 
+def _csv_value(value) -> Optional[str]:
+    """Format one record value as to_csv would; missing values become empty fields."""
+    return None if value is None or pd.isna(value) else str(value)
+
+def write_records(records: List[Dict], output_file: str) -> None:
+    """Write dict records to CSV, using pyarrow's writer when it is installed.
+
+    Columns are the union of the records' keys in first-seen order.
+    """
+    fieldnames = list(dict.fromkeys(key for record in records for key in record))
+    if PYARROW_AVAILABLE:
+        columns = {name: [_csv_value(record.get(name)) for record in records] for name in fieldnames}
+        pacsv.write_csv(pa.table(columns), output_file)
+        return
+    
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows({key: _csv_value(value) for key, value in record.items()} for record in records)
+
+def _process_html_file(html_file: Path, today: str) -> Tuple[Optional[Tuple[Dict, List, List, List]], Optional[str]]:
+    """Parse one saved profile page into processed records; runs in a worker process."""
+    try:
+        # libxml2 reads the file itself, no intermediate Python string
+        tree = lxml.html.parse(str(html_file), parser=HTML_PARSER).getroot()
+        
+        # Extract fighter name from filename
+        fighter_name = html_file.stem.replace('_', ' ')
+        
+        # Extract fighter data using the same logic as scraping
+        fighter_data = UFCFighterPipeline._extract_fighter_data_from_html(tree, fighter_name)
+        if not fighter_data:
+            return None, None
+        return UFCFighterPipeline.process_fighter_data(fighter_data, today), None
+    except Exception as e:
+        return None, str(e)
+
 def main():
     """Main entry point for the UFC fighter pipeline."""
     # Create pipeline instance with enhanced Cloudflare bypass
@@ -5,20 +5,20 @@ Dedicated script for scraping fighter profiles from UFC.com and saving HTML file
 Uses advanced Cloudflare bypass techniques.
 """
 
+import asyncio
+import httpx
 import requests
 import os
-import pandas as pd
+import csv
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-from tqdm import tqdm
+from tqdm.asyncio import tqdm
 import time
+import random
 import logging
-from typing import Dict, List, Optional
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
-from datetime import datetime
+from logging.handlers import MemoryHandler
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import deque
 import urllib.parse
-from bs4 import BeautifulSoup
 
 # Advanced scraping imports for Cloudflare bypass
 try:
@@ -33,89 +33,101 @@ except ImportError:
 
 try:
     import cloudscraper
+    from cloudscraper.exceptions import CloudflareException
     CLOUDSCRAPER_AVAILABLE = True
 except ImportError:
     CLOUDSCRAPER_AVAILABLE = False
     logging.warning("cloudscraper not available, falling back to requests")
 
-from fake_useragent import UserAgent
-
-# Configure logging
+# Configure logging; file writes are buffered and flushed on errors or every 1000 records
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+log_file_handler = logging.FileHandler('ufc_scraper.log', delay=True)
+log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler('ufc_scraper.log'),
+        MemoryHandler(capacity=1000, flushLevel=logging.ERROR, target=log_file_handler),
         logging.StreamHandler()
     ]
 )
 
+# Markers of a Cloudflare interstitial, as opposed to an ordinary 403/503 from UFC.com
+CLOUDFLARE_CHALLENGE_MARKERS = ('cf-challenge', 'challenge-platform', 'cf_chl_opt')
+
+def _is_cloudflare_challenge(response) -> bool:
+    """Whether an httpx or requests response is a Cloudflare challenge page."""
+    if response is None or response.status_code not in (403, 429, 503):
+        return False
+    if response.headers.get('cf-mitigated') == 'challenge':
+        return True
+    return any(marker in response.text for marker in CLOUDFLARE_CHALLENGE_MARKERS)
+
 class UFCScraper:
     """Dedicated UFC fighter profile scraper with Cloudflare bypass."""
     
+    REQUESTS_PER_MINUTE = 25
+    MAX_BACKOFF = 5  # Seconds; caps the retry backoff so one failing URL cannot stall a worker
+    RETRY_STATUSES = (403, 429, 500, 502, 503, 504)
+    # Current desktop Chrome builds; rotation picks from these instead of querying fake_useragent
+    USER_AGENTS = (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36',
+    )
+    
     def __init__(self, output_dir: str = 'fighter_profiles', max_workers: int = 2, 
-                 rate_limit: float = 3.0, max_retries: int = 3, use_undetected: bool = True):
+                 rate_limit: float = 3.0, max_retries: int = 3, use_undetected: bool = True,
+                 skip_existing: bool = False):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.max_workers = max_workers
         self.rate_limit = rate_limit
         self.max_retries = max_retries
         self.use_undetected = use_undetected and UNDETECTED_AVAILABLE
+        self.skip_existing = skip_existing  # Resume mode; the default upserts every fighter
         
-        # Initialize user agent generator
-        try:
-            self.ua = UserAgent()
-        except:
-            self.ua = None
-        
-        # Initialize sessions
-        self.session = self._create_session()
+        # Initialize sessions; the httpx client and locks are created inside the event loop by scrape_fighters
+        self._client: Optional[httpx.AsyncClient] = None
+        self._rate_lock: Optional[asyncio.Lock] = None
+        self._driver_lock: Optional[asyncio.Lock] = None
+        self._user_agent = random.choice(self.USER_AGENTS)  # Kept for the whole session; rotated only after a block
         self.cloudscraper_session = self._create_cloudscraper_session() if CLOUDSCRAPER_AVAILABLE else None
         self.driver = None
         
         # Statistics tracking
         self.success_count = 0
         self.failure_count = 0
-        self.last_request_time = 0
-        self.requests_this_minute = 0
-        self.minute_start = datetime.now()
+        self._recent_requests = deque()  # Monotonic send times within the last minute
+        self._next_request_at = 0.0
 
-    def _create_session(self) -> requests.Session:
-        """Create a requests session with retry strategy and headers."""
-        session = requests.Session()
-        
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=2,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"]
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create one pooled HTTP/2 client shared by every UFC.com fetch."""
+        return httpx.AsyncClient(
+            http2=True,
+            # Keep idle connections through the per-minute budget pause so resuming skips a new handshake
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=75),
+            timeout=15,
+            follow_redirects=True,
+            headers={
+                'User-Agent': self._user_agent,
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.5',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'DNT': '1',
+                'Upgrade-Insecure-Requests': '1',
+                'Sec-Fetch-Dest': 'document',
+                'Sec-Fetch-Mode': 'navigate',
+                'Sec-Fetch-Site': 'none'
+            }
         )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("https://", adapter)
-        session.mount("http://", adapter)
-        
-        # Use fake user agent if available
-        if self.ua:
-            user_agent = self.ua.random
-        else:
-            user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        
-        session.headers.update({
-            'User-Agent': user_agent,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0'
-        })
-        
-        return session
 
     def _create_cloudscraper_session(self) -> cloudscraper.CloudScraper:
         """Create a cloudscraper session for bypassing Cloudflare."""
@@ -130,8 +142,11 @@ class UFCScraper:
             }
         )
         
-        if self.ua:
-            scraper.headers['User-Agent'] = self.ua.random
+        scraper.headers['User-Agent'] = self._user_agent
+        
+        # Resize the pool of cloudscraper's own TLS adapter so every worker thread keeps its
+        # connection instead of having it discarded under contention
+        scraper.get_adapter('https://').init_poolmanager(self.max_workers, self.max_workers * 2, block=True)
         
         return scraper
 
@@ -152,8 +167,7 @@ class UFCScraper:
             options.add_argument('--disable-images')
             options.add_argument('--disable-javascript')
             
-            if self.ua:
-                options.add_argument(f'--user-agent={self.ua.random}')
+            options.add_argument(f'--user-agent={random.choice(self.USER_AGENTS)}')
             
             driver = uc.Chrome(options=options, version_main=None)
             driver.set_page_load_timeout(30)
@@ -162,78 +176,119 @@ class UFCScraper:
             logging.warning(f"Failed to initialize undetected driver: {e}")
             return None
 
-    def _rotate_user_agent(self):
-        """Rotate user agent to avoid detection."""
-        if self.ua:
-            new_ua = self.ua.random
-            self.session.headers['User-Agent'] = new_ua
-            if self.cloudscraper_session:
-                self.cloudscraper_session.headers['User-Agent'] = new_ua
+    def _rotate_user_agent(self) -> None:
+        """Switch to a different user agent after a block, starting fresh sessions to go with it."""
+        self._user_agent = random.choice([ua for ua in self.USER_AGENTS if ua != self._user_agent])
+        # Cloudflare binds clearance cookies to the user agent that earned them, so they go too
+        self._client.headers['User-Agent'] = self._user_agent
+        self._client.cookies.clear()
+        if self.cloudscraper_session:
+            self.cloudscraper_session = self._create_cloudscraper_session()
 
-    def _rate_limit_wait(self):
+    async def _rate_limit_wait(self):
         """Implement rate limiting to respect server limits."""
-        current_time = datetime.now()
-        
-        if (current_time - self.minute_start).total_seconds() >= 60:
-            self.requests_this_minute = 0
-            self.minute_start = current_time
-        
-        if self.requests_this_minute >= 25:
-            sleep_time = 60 - (current_time - self.minute_start).total_seconds()
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-                self.minute_start = datetime.now()
-                self.requests_this_minute = 0
-        
-        time_since_last = time.time() - self.last_request_time
-        if time_since_last < self.rate_limit:
-            time.sleep(self.rate_limit - time_since_last)
-        
-        self.last_request_time = time.time()
-        self.requests_this_minute += 1
+        # Concurrent fetches take turns so the per-minute budget and spacing stay global
+        async with self._rate_lock:
+            now = time.monotonic()
+            
+            # Sliding one-minute window: wait for the oldest request to age out once the budget is spent
+            while self._recent_requests and now - self._recent_requests[0] >= 60:
+                self._recent_requests.popleft()
+            if len(self._recent_requests) >= self.REQUESTS_PER_MINUTE:
+                await asyncio.sleep(self._recent_requests.popleft() + 60 - now)
+                now = time.monotonic()
+            
+            # Space consecutive requests at least rate_limit seconds apart, jittered so retries after
+            # a 429 do not arrive in lockstep
+            if now < self._next_request_at:
+                await asyncio.sleep(self._next_request_at - now)
+                now = time.monotonic()
+            
+            self._next_request_at = now + self.rate_limit + random.uniform(0, 0.25)
+            self._recent_requests.append(now)
 
-    def _make_request(self, url: str, retries: int = 0) -> Optional[requests.Response]:
+    async def _make_request(self, url: str) -> Optional[httpx.Response]:
         """Make HTTP request with rate limiting and retry logic, with Cloudflare bypass."""
-        try:
-            self._rate_limit_wait()
-            self._rotate_user_agent()
-            
-            # Try regular requests first
+        for attempt in range(self.max_retries + 1):
             try:
-                response = self.session.get(url, timeout=15)
-                response.raise_for_status()
-                return response
-            except requests.exceptions.RequestException as e:
-                logging.warning(f"Regular request failed for {url}: {e}")
-                
-                # Try cloudscraper if available
-                if self.cloudscraper_session:
-                    try:
-                        logging.info(f"Attempting cloudscraper for {url}")
-                        response = self.cloudscraper_session.get(url, timeout=20)
-                        response.raise_for_status()
-                        return response
-                    except Exception as e2:
-                        logging.warning(f"Cloudscraper failed for {url}: {e2}")
+                await self._rate_limit_wait()
                 
-                # Try undetected driver as last resort
-                if self.use_undetected and UNDETECTED_AVAILABLE:
-                    try:
-                        logging.info(f"Attempting undetected driver for {url}")
-                        return self._make_request_with_driver(url)
-                    except Exception as e3:
-                        logging.warning(f"Undetected driver failed for {url}: {e3}")
+                # Try the pooled httpx client first
+                try:
+                    response = await self._client.get(url)
+                    response.raise_for_status()
+                    return response
+                except httpx.HTTPError as e:
+                    logging.warning("Regular request failed for %s: %s", url, e)
+                    challenged = _is_cloudflare_challenge(getattr(e, 'response', None))
+                    
+                    # Try cloudscraper if available; it is blocking, so run it off the event loop
+                    if self.cloudscraper_session:
+                        try:
+                            logging.info("Attempting cloudscraper for %s", url)
+                            response = await asyncio.to_thread(self.cloudscraper_session.get, url, timeout=20)
+                            response.raise_for_status()
+                            self._adopt_clearance(
+                                ((c.name, c.value, c.domain, c.path) for c in self.cloudscraper_session.cookies),
+                                self.cloudscraper_session.headers.get('User-Agent')
+                            )
+                            return response
+                        except Exception as e2:
+                            logging.warning("Cloudscraper failed for %s: %s", url, e2)
+                            challenged = (challenged or isinstance(e2, CloudflareException)
+                                          or _is_cloudflare_challenge(getattr(e2, 'response', None)))
+                    
+                    # Start the browser only for a Cloudflare challenge the lighter clients could not pass;
+                    # there is one browser, so one page at a time
+                    if challenged and self.use_undetected and UNDETECTED_AVAILABLE:
+                        try:
+                            logging.info("Attempting undetected driver for %s", url)
+                            async with self._driver_lock:
+                                response = await asyncio.to_thread(self._make_request_with_driver, url)
+                                if response is not None:
+                                    try:
+                                        self._adopt_clearance(*await asyncio.to_thread(self._driver_clearance))
+                                    except Exception as e4:
+                                        logging.warning("Could not copy clearance from undetected driver: %s", e4)
+                                return response
+                        except Exception as e3:
+                            logging.warning("Undetected driver failed for %s: %s", url, e3)
+                    
+                    raise e
                 
-                raise e
-            
-        except requests.exceptions.RequestException as e:
-            if retries < self.max_retries:
-                logging.warning(f"Request failed for {url}, retrying ({retries + 1}/{self.max_retries}): {e}")
-                time.sleep(2 ** retries)  # Exponential backoff
-                return self._make_request(url, retries + 1)
-            else:
-                logging.error(f"Failed to fetch {url} after {self.max_retries} retries: {e}")
-                return None
+            except httpx.HTTPError as e:
+                status = getattr(getattr(e, 'response', None), 'status_code', None)
+                # A block is the only reason to change identity; rotating on every request forces re-challenges
+                if status in (403, 503):
+                    self._rotate_user_agent()
+                # Transport errors and throttling/server statuses are worth another try; a 404 is not
+                if attempt == self.max_retries or (status is not None and status not in self.RETRY_STATUSES):
+                    logging.error("Failed to fetch %s after %s retries: %s", url, attempt, e)
+                    return None
+                logging.warning("Request failed for %s, retrying (%s/%s): %s", url, attempt + 1, self.max_retries, e)
+                await asyncio.sleep(self._retry_delay(getattr(e, 'response', None), attempt))
+
+    def _retry_delay(self, response: Optional[httpx.Response], attempt: int) -> float:
+        """Seconds to wait before retrying: the server's Retry-After when given, otherwise a short
+        capped exponential backoff, jittered so throttled workers do not return in lockstep."""
+        retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+        if retry_after.isdigit():
+            return min(int(retry_after), 60) + random.uniform(0, 0.25)
+        return min(0.3 * 2 ** attempt, self.MAX_BACKOFF) + random.uniform(0, 0.25)
+
+    def _adopt_clearance(self, cookies: Iterable[Tuple[str, str, str, str]], user_agent: Optional[str]) -> None:
+        """Copy (name, value, domain, path) cookies from a fallback into the httpx client so later
+        requests reuse its Cloudflare clearance instead of being challenged again."""
+        for name, value, domain, path in cookies:
+            self._client.cookies.set(name, value, domain=domain, path=path)
+        if user_agent:
+            self._user_agent = user_agent
+            self._client.headers['User-Agent'] = user_agent
+
+    def _driver_clearance(self) -> Tuple[List[Tuple[str, str, str, str]], str]:
+        """Cookies and user agent of the undetected browser after it has passed a challenge."""
+        cookies = [(c['name'], c['value'], c.get('domain', ''), c.get('path', '/')) for c in self.driver.get_cookies()]
+        return cookies, self.driver.execute_script('return navigator.userAgent')
 
     def _make_request_with_driver(self, url: str) -> Optional[requests.Response]:
         """Make request using undetected Chrome driver."""
@@ -250,44 +305,51 @@ class UFCScraper:
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
-            # Get page source
-            page_source = self.driver.page_source
-            
-            # Create a mock response object
-            class MockResponse:
-                def __init__(self, text, status_code=200):
-                    self.text = text
-                    self.status_code = status_code
-                
-                def raise_for_status(self):
-                    if self.status_code >= 400:
-                        raise requests.exceptions.HTTPError(f"HTTP {self.status_code}")
-            
-            return MockResponse(page_source)
+            # Wrap the page source in a real Response so callers get .content, .text and .iter_content
+            response = requests.Response()
+            response._content = self.driver.page_source.encode('utf-8')
+            response.status_code = 200
+            response.encoding = 'utf-8'
+            response.url = url
+            return response
             
         except Exception as e:
             logging.error(f"Driver request failed for {url}: {e}")
             return None
 
-    def scrape_fighter_profile(self, fighter_name: str) -> bool:
+    @staticmethod
+    async def _save_html(html_file: Path, content: bytes) -> None:
+        """Write the raw page bytes off the event loop so requests keep flowing while the disk catches up."""
+        await asyncio.to_thread(html_file.write_bytes, content)
+
+    def _html_file(self, fighter_name: str) -> Path:
+        return self.output_dir / f"{fighter_name.replace(' ', '_')}_ufc.html"
+
+    @staticmethod
+    def _profile_url(fighter_name: str) -> str:
+        """UFC.com athlete URL for a fighter name."""
+        slug = fighter_name.lower().replace(' ', '-')
+        # Nearly every slug is already [a-z0-9-]; only quote the ones that are not
+        if not (slug.isascii() and slug.replace('-', '').isalnum()):
+            slug = urllib.parse.quote(slug)
+        return f"https://www.ufc.com/athlete/{slug}"
+
+    async def scrape_fighter_profile(self, fighter_name: str, url: Optional[str] = None) -> bool:
         """Scrape a single fighter profile and save HTML."""
         try:
-            # Format fighter name for URL
-            formatted_name = urllib.parse.quote(fighter_name.lower().replace(' ', '-'))
-            url = f"https://www.ufc.com/athlete/{formatted_name}"
+            url = url or self._profile_url(fighter_name)
             
-            response = self._make_request(url)
+            response = await self._make_request(url)
             if not response:
                 return False
             
             # Save HTML file (upsert mode - overwrites existing files)
-            html_file = self.output_dir / f"{fighter_name.replace(' ', '_')}_ufc.html"
+            html_file = self._html_file(fighter_name)
             if html_file.exists():
-                logging.info(f"Overwriting existing UFC HTML for {fighter_name}")
+                logging.debug("Overwriting existing UFC HTML for %s", fighter_name)
             else:
-                logging.info(f"Creating new UFC HTML for {fighter_name}")
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(response.text)
+                logging.debug("Creating new UFC HTML for %s", fighter_name)
+            await self._save_html(html_file, response.content)
             
             return True
             
@@ -297,26 +359,55 @@ class UFCScraper:
 
     def scrape_fighters(self, fighters: List[str]) -> None:
         """Scrape data for all fighters."""
+        if self.skip_existing:
+            # One directory listing up front instead of a request per already-saved fighter
+            existing = {path.name for path in self.output_dir.glob('*_ufc.html')}
+            remaining = [fighter for fighter in fighters if self._html_file(fighter).name not in existing]
+            logging.info(f"Skipping {len(fighters) - len(remaining)} fighters with saved UFC HTML")
+            fighters = remaining
+        
         logging.info(f"Starting to scrape data for {len(fighters)} fighters")
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit scraping tasks
-            futures = {executor.submit(self.scrape_fighter_profile, fighter): fighter for fighter in fighters}
-            
-            # Process completed tasks
-            for future in tqdm(futures, desc="Scraping UFC profiles"):
-                fighter_name = futures[future]
-                try:
-                    success = future.result()
-                    if success:
-                        self.success_count += 1
-                        logging.info(f"Successfully scraped {fighter_name}")
-                    else:
-                        self.failure_count += 1
-                        logging.warning(f"Failed to scrape {fighter_name}")
-                except Exception as e:
-                    self.failure_count += 1
-                    logging.error(f"Error processing {fighter_name}: {e}")
+        results = asyncio.run(self._scrape_profiles(fighters))
+        
+        # Process completed tasks
+        for fighter_name, success in zip(fighters, results):
+            if success:
+                self.success_count += 1
+                logging.debug("Successfully scraped %s", fighter_name)
+            else:
+                self.failure_count += 1
+                logging.warning(f"Failed to scrape {fighter_name}")
+
+    async def _scrape_profiles(self, fighters: List[str]) -> List[bool]:
+        """Fetch every profile over one pooled client, max_workers at a time."""
+        self._rate_lock = asyncio.Lock()
+        self._driver_lock = asyncio.Lock()
+        semaphore = asyncio.Semaphore(self.max_workers)
+        
+        async def scrape(fighter_name: str, url: str) -> bool:
+            async with semaphore:
+                return await self.scrape_fighter_profile(fighter_name, url)
+        
+        # Build every URL up front so the workers only fetch and save
+        urls = [self._profile_url(fighter) for fighter in fighters]
+        
+        async with self._create_client() as client:
+            self._client = client
+            await self._warm_up()
+            try:
+                return await tqdm.gather(*(scrape(fighter, url) for fighter, url in zip(fighters, urls)),
+                                         desc="Scraping UFC profiles")
+            finally:
+                self._client = None
+
+    async def _warm_up(self) -> None:
+        """Resolve DNS and open the TLS connection with one HEAD before the workers start,
+        so the first profile fetches reuse it instead of each paying a fresh handshake."""
+        try:
+            await self._client.head('https://www.ufc.com/', timeout=10)
+        except httpx.HTTPError as e:
+            logging.debug("Warm-up request to UFC.com failed: %s", e)
 
     def cleanup(self):
         """Clean up resources."""
@@ -333,14 +424,18 @@ class UFCScraper:
         
         # Load fighter names
         try:
-            df = pd.read_csv(fighters_file)
-            if 'Fighter Name' in df.columns:
-                fighters = df['Fighter Name'].tolist()
-            elif 'fighters' in df.columns:
-                fighters = df['fighters'].tolist()
-            else:
-                logging.error(f"Could not find 'Fighter Name' or 'fighters' column in {fighters_file}")
-                return
+            # A single column of names does not need a DataFrame; utf-8-sig drops a BOM like pandas does
+            with open(fighters_file, newline='', encoding='utf-8-sig') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                if 'Fighter Name' in header:
+                    col = header.index('Fighter Name')
+                elif 'fighters' in header:
+                    col = header.index('fighters')
+                else:
+                    logging.error(f"Could not find 'Fighter Name' or 'fighters' column in {fighters_file}")
+                    return
+                fighters = [row[col] for row in reader if len(row) > col and row[col]]
         except Exception as e:
             logging.error(f"Error loading fighter names from {fighters_file}: {e}")
             return
@@ -384,7 +479,8 @@ def main():
         max_workers=2,
         rate_limit=3.0,
         max_retries=3,
-        use_undetected=True
+        use_undetected=True,
+        skip_existing=os.environ.get('SKIP_EXISTING', '').strip().lower() in ('1', 'true', 'yes')
     )
     
     try: